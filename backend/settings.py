@@ -10,7 +10,9 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+from datetime import timedelta
 from pathlib import Path
+from importlib.util import find_spec
 import os
 import dj_database_url
 
@@ -41,11 +43,13 @@ INSTALLED_APPS = [
     'django.contrib.staticfiles',
 
     'rest_framework',
+    'django_filters',
     'corsheaders',
     'core',
 ]
 
 MIDDLEWARE = [
+    'core.middleware.PerformanceMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
 
@@ -103,9 +107,78 @@ else:
     }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'default',
+    },
+    # enhanced fingerprint images: per-process LRU in front of an on-disk tier
+    'fingerprints-local': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'fingerprints',
+        'TIMEOUT': 60 * 60,
+        'OPTIONS': {'MAX_ENTRIES': 200},
+    },
+    'fingerprints': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.environ.get('FINGERPRINT_CACHE_DIR', BASE_DIR / 'cache' / 'fingerprints'),
+        'TIMEOUT': 30 * 24 * 60 * 60,
+        'OPTIONS': {'MAX_ENTRIES': 5000, 'CULL_FREQUENCY': 4},
+    },
+    # cached_db sessions; on disk by default so a logout is seen by every worker on the host
+    'sessions': {
+        'BACKEND': os.environ.get('SESSION_CACHE_BACKEND', 'django.core.cache.backends.filebased.FileBasedCache'),
+        'LOCATION': os.environ.get('SESSION_CACHE_LOCATION', BASE_DIR / 'cache' / 'sessions'),
+        'OPTIONS': {'MAX_ENTRIES': 10000},
+    },
+    # authenticated users (core.backends.CachedModelBackend), per process
+    'users': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'users',
+        'OPTIONS': {'MAX_ENTRIES': 1000},
+    },
+    # login/register token buckets (core.throttling), per process
+    'throttle': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'throttle',
+        'OPTIONS': {'MAX_ENTRIES': 50000},
+    },
+    # jti of revoked JWTs until they expire (core.authentication), shared by the host's workers
+    'revoked-tokens': {
+        'BACKEND': os.environ.get('REVOKED_TOKENS_CACHE_BACKEND', 'django.core.cache.backends.filebased.FileBasedCache'),
+        'LOCATION': os.environ.get('REVOKED_TOKENS_CACHE_LOCATION', BASE_DIR / 'cache' / 'revoked-tokens'),
+        'OPTIONS': {'MAX_ENTRIES': 100000},
+    },
+}
+
+SESSION_ENGINE = os.environ.get('SESSION_ENGINE', 'django.contrib.sessions.backends.cached_db')
+SESSION_CACHE_ALIAS = 'sessions'
+
+# one backend only: authenticate() tries each in turn, so a second one would
+# hash every failed password twice. Sessions that still name ModelBackend log in again.
+AUTHENTICATION_BACKENDS = [
+    'core.backends.CachedModelBackend',
+]
+AUTH_USER_CACHE_TIMEOUT = int(os.environ.get('AUTH_USER_CACHE_TIMEOUT', 60))
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
+PASSWORD_HASHERS = [
+    'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+]
+# With argon2-cffi installed, new passwords use Argon2 and PBKDF2 ones are rehashed on their next login
+if find_spec('argon2') and os.environ.get('PASSWORD_HASHER_ARGON2', 'True') == 'True':
+    PASSWORD_HASHERS.insert(0, PASSWORD_HASHERS.pop(2))
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -148,7 +221,23 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
         'rest_framework.authentication.SessionAuthentication',
+        'core.authentication.StatelessJWTAuthentication',
     ],
+    # token buckets for password checks: capacity/period (see core.throttling)
+    'DEFAULT_THROTTLE_RATES': {
+        'login_ip': os.environ.get('THROTTLE_LOGIN_IP', '20/min'),
+        'login_username': os.environ.get('THROTTLE_LOGIN_USERNAME', '5/min'),
+        'register_ip': os.environ.get('THROTTLE_REGISTER_IP', '10/hour'),
+    },
+    # client address is the last X-Forwarded-For hop added by the platform's proxy
+    'NUM_PROXIES': int(os.environ.get('NUM_PROXIES', 1)),
+}
+
+SIMPLE_JWT = {
+    'ACCESS_TOKEN_LIFETIME': timedelta(minutes=int(os.environ.get('JWT_ACCESS_TOKEN_MINUTES', 5))),
+    'REFRESH_TOKEN_LIFETIME': timedelta(days=int(os.environ.get('JWT_REFRESH_TOKEN_DAYS', 1))),
+    'AUTH_HEADER_TYPES': ('Bearer',),
+    'UPDATE_LAST_LOGIN': False,
 }
 
 CORS_ALLOW_CREDENTIALS = True
@@ -168,11 +257,33 @@ CSRF_TRUSTED_ORIGINS = [
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Storage alias (see STORAGES) holding content-addressed fingerprint blobs
+FINGERPRINT_STORAGE = os.environ.get('FINGERPRINT_STORAGE', 'default')
+
 STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 
 FILE_UPLOAD_MAX_MEMORY_SIZE = 10*1024*1024  # 10 MB
 DATA_UPLOAD_MAX_MEMORY_SIZE = 10*1024*1024  # 10 MB
 
+# Multipart fingerprint uploads (see core.uploads)
+FINGERPRINT_MAX_UPLOAD_SIZE = 5*1024*1024  # 5 MB per finger
+FINGERPRINT_MAX_DIMENSION = 4096  # pixels
+
+# Normalize fingerprints on ingest to lossless 8-bit grayscale, 'png' or 'webp'
+FINGERPRINT_NORMALIZE = os.environ.get('FINGERPRINT_NORMALIZE', 'True') == 'True'
+FINGERPRINT_STORAGE_FORMAT = os.environ.get('FINGERPRINT_STORAGE_FORMAT', 'png')
+
+# Unreferenced blobs are removed by `manage.py sweep_blobs` once this old, so
+# uploads whose order isn't committed yet keep their files
+BLOB_SWEEP_GRACE_SECONDS = int(os.environ.get('BLOB_SWEEP_GRACE_SECONDS', 3600))
+# how often the enhancement worker (Procfile `worker`) runs that sweep
+BLOB_SWEEP_INTERVAL_SECONDS = int(os.environ.get('BLOB_SWEEP_INTERVAL_SECONDS', 15 * 60))
+
+# Request instrumentation (core.middleware.PerformanceMiddleware); metrics at /api/metrics/
+PERFORMANCE_SERVER_TIMING = os.environ.get('PERFORMANCE_SERVER_TIMING', 'True') == 'True'
+PERFORMANCE_SLOW_REQUEST_MS = int(os.environ.get('PERFORMANCE_SLOW_REQUEST_MS', 1000))
+PERFORMANCE_MAX_QUERIES = int(os.environ.get('PERFORMANCE_MAX_QUERIES', 20))
+
 SESSION_COOKIE_SAMESITE = "None"
 CSRF_COOKIE_SAMESITE = "None"
 SESSION_COOKIE_SECURE = True
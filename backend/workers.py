@@ -0,0 +1,15 @@
+import os
+
+from uvicorn_worker import UvicornWorker
+
+
+class UvicornLimitedWorker(UvicornWorker):
+    """UvicornWorker that answers 503 once a worker holds UVICORN_LIMIT_CONCURRENCY connections and tasks.
+
+    Gunicorn's worker_connections only applies to its own threaded and green
+    workers; this is uvicorn's equivalent.
+    """
+    CONFIG_KWARGS = {
+        **UvicornWorker.CONFIG_KWARGS,
+        "limit_concurrency": int(os.environ.get("UVICORN_LIMIT_CONCURRENCY", 1000)),
+    }
@@ -0,0 +1,145 @@
+import json
+
+from asgiref.sync import sync_to_async
+from django.db import connection
+from django.http import JsonResponse
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import status
+from rest_framework.authentication import SessionAuthentication
+from rest_framework.exceptions import APIException
+
+from .authentication import StatelessJWTAuthentication
+from .deletion import delete_orders
+from .filters import OrderFilter
+from .jobs import aenhanced_results, aqueue_enhancement
+from .models import Order
+from .pagination import OrderPagination
+from .serializers import OrderListSerializer, OrderSerializer
+from .utils import InvalidFingerprint, save_fingerprints
+from .views import _fingerprint_urls, _inline_fingerprints
+
+def _save_fingerprints(fingerprints):
+    # storing a blob updates the sweep queue; no request cycle closes this
+    # executor thread's connection, and the thread may not run again for a while
+    try:
+        return save_fingerprints(fingerprints)
+    finally:
+        connection.close()
+
+
+# image decoding and OpenCV release the GIL, so run them outside the event loop
+# on the shared executor instead of the single thread kept for sync ORM calls
+save_fingerprints_async = sync_to_async(_save_fingerprints, thread_sensitive=False)
+inline_fingerprints_async = sync_to_async(_inline_fingerprints, thread_sensitive=False)
+
+
+def _error_response(exc):
+    detail = exc.detail if isinstance(exc.detail, dict) else {"detail": exc.detail}
+    return JsonResponse(detail, status=exc.status_code)
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class AsyncAPIView(View):
+    """Async view returning JSON, for ASGI workers.
+
+    DRF's APIView is sync only, so this keeps the same response bodies on top
+    of Django's async ORM. Accepts a JWT bearer token or a session; as in DRF,
+    only session-authenticated requests are checked for a CSRF token.
+    """
+
+    async def dispatch(self, request, *args, **kwargs):
+        try:
+            # signature check and revoked-token lookup only, no database access
+            authenticated = StatelessJWTAuthentication().authenticate(request)
+        except APIException as exc:
+            return _error_response(exc)
+        self.user = authenticated[0] if authenticated else await request.auser()
+        if not self.user.is_authenticated:
+            return JsonResponse({"detail": "Authentication credentials were not provided."}, status=status.HTTP_403_FORBIDDEN)
+        try:
+            if not authenticated:
+                SessionAuthentication().enforce_csrf(request)
+            return await super().dispatch(request, *args, **kwargs)
+        except APIException as exc:
+            return _error_response(exc)
+
+
+class AsyncOrderView(AsyncAPIView):
+    pagination_class = OrderPagination
+
+    async def get(self, request):
+        orders = Order.objects.summary()
+        if not self.user.is_staff:
+            orders = orders.filter(created_by_id=self.user.id)
+
+        filterset = OrderFilter(request.GET, queryset=orders, request=request)
+        if not filterset.is_valid():
+            return JsonResponse(filterset.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        paginator = self.pagination_class()
+        page = await paginator.apaginate_queryset(filterset.qs, request, view=self)
+        serializer = OrderListSerializer(page, many=True)
+        return JsonResponse(paginator.get_paginated_data(serializer.data))
+
+    async def post(self, request):
+        try:
+            data = json.loads(request.body)
+        except ValueError:
+            return JsonResponse({"error": "Invalid JSON"}, status=status.HTTP_400_BAD_REQUEST)
+
+        serializer = OrderSerializer(data=data)
+        if not serializer.is_valid():
+            return JsonResponse(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        validated_data = dict(serializer.validated_data)
+        try:
+            validated_data['fingerprints'] = await save_fingerprints_async(validated_data.get('fingerprints'))
+        except InvalidFingerprint as e:
+            return JsonResponse({'fingerprints': {e.finger: str(e)}}, status=status.HTTP_400_BAD_REQUEST)
+
+        order = await Order.objects.acreate(**validated_data, created_by_id=self.user.id)
+        await aqueue_enhancement([order])
+
+        response_data = {
+            'message': 'Order submitted successfully',
+            'id': order.pk,
+            'application_id': order.application_id,
+            'order_type': order.orderType,
+            'fingerprints': _fingerprint_urls(request, order, self.user.is_staff),
+        }
+        return JsonResponse(response_data, status=status.HTTP_201_CREATED)
+
+    async def delete(self, request, pk=None):
+        if not pk:
+            return JsonResponse({'error': 'order id not provided'}, status=400)
+        orders = Order.objects.filter(pk=pk)
+        if not self.user.is_staff:
+            orders = orders.filter(created_by_id=self.user.id)
+        if await sync_to_async(delete_orders)(orders):
+            return JsonResponse({'message': 'Order Deleted'}, status=status.HTTP_204_NO_CONTENT)
+        if await Order.objects.filter(pk=pk).aexists():
+            return JsonResponse({"error": 'Not authorized'}, status=status.HTTP_403_FORBIDDEN)
+        return JsonResponse({'error': 'Order not found'}, status=status.HTTP_404_NOT_FOUND)
+
+
+class AsyncFingerprintsView(AsyncAPIView):
+
+    async def get(self, request, pk):
+        try:
+            order = await Order.objects.full().aget(pk=pk)
+        except Order.DoesNotExist:
+            return JsonResponse({"error": "Order not found."}, status=status.HTTP_404_NOT_FOUND)
+        if not self.user.is_staff and order.created_by_id != self.user.id:
+            return JsonResponse({"error": "Not authorized"}, status=status.HTTP_403_FORBIDDEN)
+
+        if request.GET.get("inline"):
+            precomputed = await aenhanced_results(order) if self.user.is_staff else None
+            fingerprints = await inline_fingerprints_async(order, self.user.is_staff, precomputed)
+        else:
+            fingerprints = _fingerprint_urls(request, order, self.user.is_staff)
+
+        data = OrderSerializer(order).data
+        data['fingerprints'] = fingerprints
+        return JsonResponse({"data": data}, status=status.HTTP_200_OK)
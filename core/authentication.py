@@ -0,0 +1,38 @@
+import time
+
+from django.core.cache import caches
+from rest_framework_simplejwt.authentication import JWTStatelessUserAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+REVOKED_CACHE_ALIAS = "revoked-tokens"
+
+
+def _revoked_key(jti):
+    return f"revoked:{jti}"
+
+
+def revoke_token(token):
+    """Reject `token` from now until it would have expired anyway"""
+    remaining = int(token["exp"] - time.time())
+    if remaining > 0:
+        caches[REVOKED_CACHE_ALIAS].set(_revoked_key(token[api_settings.JTI_CLAIM]), True, remaining)
+
+
+def is_revoked(token):
+    return caches[REVOKED_CACHE_ALIAS].get(_revoked_key(token.get(api_settings.JTI_CLAIM))) is not None
+
+
+class StatelessJWTAuthentication(JWTStatelessUserAuthentication):
+    """Bearer access tokens verified by signature alone.
+
+    request.user is a TokenUser built from the claims (id, username,
+    is_staff), so a request costs no session or user query, only a lookup in
+    the revoked-token cache.
+    """
+
+    def get_validated_token(self, raw_token):
+        token = super().get_validated_token(raw_token)
+        if is_revoked(token):
+            raise InvalidToken({"detail": "Token has been revoked", "code": "token_revoked"})
+        return token
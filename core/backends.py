@@ -0,0 +1,32 @@
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import caches
+
+USER_CACHE_ALIAS = "users"
+
+
+def user_cache_key(user_id):
+    return f"auth:user:{user_id}"
+
+
+def invalidate_cached_user(user_id):
+    caches[USER_CACHE_ALIAS].delete(user_cache_key(user_id))
+
+
+class CachedModelBackend(ModelBackend):
+    """ModelBackend whose per-request user lookup is served from a short-TTL cache.
+
+    The cache is per process, so a change made through another worker shows up
+    here within AUTH_USER_CACHE_TIMEOUT seconds; local saves and deletes clear
+    it at once (see core.signals).
+    """
+
+    def get_user(self, user_id):
+        cache = caches[USER_CACHE_ALIAS]
+        key = user_cache_key(user_id)
+        user = cache.get(key)
+        if user is None:
+            user = super().get_user(user_id)
+            if user is not None:
+                cache.set(key, user, getattr(settings, "AUTH_USER_CACHE_TIMEOUT", 60))
+        return user
@@ -0,0 +1,4 @@
+"""Micro-benchmarks and an in-process HTTP load run for the core API.
+
+Run with `python manage.py benchmark`; see that command for options.
+"""
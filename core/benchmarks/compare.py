@@ -0,0 +1,22 @@
+LATENCY_METRICS = ("p50_ms", "p95_ms", "p99_ms")
+
+
+def compare(results, baseline, tolerance=0.2):
+    """Metrics in `results` that regressed against `baseline`.
+
+    Latencies may grow by `tolerance` (a fraction) before they count; query
+    counts may not grow at all, since an extra query per request is usually an
+    N+1 rather than noise. Returns a list of (benchmark, metric, baseline, current).
+    """
+    regressions = []
+    for section in ("micro", "load"):
+        for name, current in results.get(section, {}).items():
+            previous = baseline.get(section, {}).get(name)
+            if not previous:
+                continue
+            for metric in LATENCY_METRICS:
+                if metric in previous and current[metric] > previous[metric] * (1 + tolerance):
+                    regressions.append((f"{section}.{name}", metric, previous[metric], current[metric]))
+            if current.get("queries_per_request", 0) > previous.get("queries_per_request", float("inf")):
+                regressions.append((f"{section}.{name}", "queries_per_request", previous["queries_per_request"], current["queries_per_request"]))
+    return regressions
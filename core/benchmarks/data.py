@@ -0,0 +1,85 @@
+import base64
+import random
+
+import cv2
+import numpy as np
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+
+from core.models import Order
+from core.utils import save_fingerprints
+
+PASSWORD = "bench-password"
+FINGERS = ["left_thumb", "left_index", "right_thumb", "right_index"]
+ORDER_TYPES = ["mobile", "child", "demographics"]
+
+
+def fingerprint_png(seed, size=(400, 300)):
+    """A synthetic grayscale fingerprint: curved ridges around a core, with sensor noise"""
+    rng = np.random.default_rng(seed)
+    height, width = size
+    y, x = np.mgrid[0:height, 0:width].astype(np.float32)
+    cy, cx = height * rng.uniform(0.4, 0.6), width * rng.uniform(0.4, 0.6)
+    radius = np.hypot(x - cx, (y - cy) * 1.3)
+    angle = np.arctan2(y - cy, x - cx)
+    ridges = np.sin(radius / rng.uniform(3.5, 5.0) + 2.0 * np.sin(angle + rng.uniform(0, np.pi)))
+
+    # elliptical contact area that fades out towards the edges
+    mask = np.clip(1.4 - np.hypot((x - width / 2) / (width / 2), (y - height / 2) / (height / 2)), 0, 1)
+    image = 255 - (ridges * 0.5 + 0.5) * mask * 180 - rng.normal(0, 12, size)
+    image = cv2.GaussianBlur(np.clip(image, 0, 255).astype(np.uint8), (3, 3), 0)
+    return cv2.imencode(".png", image)[1].tobytes()
+
+
+def fingerprint_payload(seed):
+    """{finger: {"BitmapData": base64}} as the scanner clients send it"""
+    return {
+        finger: {"BitmapData": base64.b64encode(fingerprint_png(seed * len(FINGERS) + i)).decode("ascii")}
+        for i, finger in enumerate(FINGERS)
+    }
+
+
+def order_payload(rng, fingerprints, order_type=None):
+    """A valid OrderSerializer input, of a random order type unless one is given"""
+    order_type = order_type or rng.choice(ORDER_TYPES)
+    data = {
+        "orderType": order_type,
+        "fullName": f"Bench Person {rng.randrange(10**6)}",
+        "aadhaarNumber": f"{rng.randrange(10**11, 10**12)}",
+        "mobileNumber": f"9{rng.randrange(10**8, 10**9)}",
+    }
+    if order_type != "mobile":
+        data.update({
+            "dateOfBirth": "1990-01-01",
+            "gender": rng.choice(["male", "female", "other"]),
+            "village": "Village",
+            "post": "Post",
+            "district": f"District {rng.randrange(700)}",
+            "state": f"State {rng.randrange(36)}",
+            "pincode": f"{rng.randrange(100000, 999999)}",
+            "fingerprints": fingerprints,
+        })
+        if order_type == "child":
+            data["fatherAadhaarNumber"] = f"{rng.randrange(10**11, 10**12)}"
+    return data
+
+
+def seed(operators=5, orders=500, fingerprint_sets=8, random_seed=42):
+    """Create a staff user, operators and orders; returns (staff, operators, order ids)"""
+    rng = random.Random(random_seed)
+    # hashing is deliberately slow, so hash once and share it
+    password = make_password(PASSWORD)
+    staff = User.objects.create(username="bench_staff", is_staff=True, password=password)
+    users = User.objects.bulk_create([User(username=f"bench_op_{i}", password=password) for i in range(operators)])
+
+    stored = [save_fingerprints(fingerprint_payload(i)) for i in range(fingerprint_sets)]
+    fields = {f.name for f in Order._meta.get_fields()}
+    created = Order.objects.bulk_create([
+        Order(
+            created_by=rng.choice(users),
+            **{key: value for key, value in order_payload(rng, None).items() if key in fields and key != "fingerprints"},
+            fingerprints=rng.choice(stored),
+        )
+        for _ in range(orders)
+    ], batch_size=500)
+    return staff, users, [order.pk for order in created]
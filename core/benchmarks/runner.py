@@ -0,0 +1,152 @@
+import json
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+
+from core.models import Order
+from core.serializers import OrderListSerializer, OrderSerializer
+from core.utils import enhance_fingerprint
+
+from .data import PASSWORD, fingerprint_payload, order_payload
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+def summarize(timings, elapsed, **extra):
+    """Latency percentiles in ms and throughput for a list of per-call seconds"""
+    ms = sorted(t * 1000 for t in timings)
+    return {
+        "count": len(ms),
+        "mean_ms": round(sum(ms) / len(ms), 3) if ms else 0.0,
+        "p50_ms": round(percentile(ms, 50), 3),
+        "p95_ms": round(percentile(ms, 95), 3),
+        "p99_ms": round(percentile(ms, 99), 3),
+        "throughput_per_s": round(len(ms) / elapsed, 2) if elapsed else 0.0,
+        **extra,
+    }
+
+
+def timed(func, iterations, warmup=3):
+    for _ in range(warmup):
+        func()
+    timings = []
+    started = time.perf_counter()
+    for _ in range(iterations):
+        call_started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - call_started)
+    return summarize(timings, time.perf_counter() - started)
+
+
+def run_micro(iterations):
+    """Time the hot functions on their own, outside of any request"""
+    bitmap = fingerprint_payload(0)["left_thumb"]["BitmapData"]
+    payload = order_payload(random.Random(1), fingerprint_payload(1), order_type="child")
+    orders = list(Order.objects.summary().order_by("-created_at", "-id")[:50])
+
+    def validate():
+        serializer = OrderSerializer(data=payload)
+        if not serializer.is_valid():
+            raise AssertionError(serializer.errors)
+
+    return {
+        "enhance_fingerprint": timed(lambda: enhance_fingerprint(bitmap), max(1, iterations // 5)),
+        "order_serializer_validate": timed(validate, iterations),
+        "order_list_serialize_50": timed(lambda: OrderListSerializer(orders, many=True).data, iterations),
+    }
+
+
+class Scenario:
+    """One endpoint hit repeatedly by a logged-in (or anonymous) client"""
+
+    def __init__(self, name, method, path, user=None, body=None):
+        self.name = name
+        self.method = method
+        self.path = path
+        self.user = user
+        self.body = body
+
+    def client(self):
+        client = Client()
+        if self.user is not None:
+            client.force_login(self.user)
+        return client
+
+    def request(self, client, i):
+        path = self.path(i) if callable(self.path) else self.path
+        if self.method == "post":
+            body = self.body(i) if callable(self.body) else self.body
+            return client.post(path, json.dumps(body), content_type="application/json")
+        return client.get(path)
+
+
+def scenarios(staff, operators, order_ids):
+    operator = operators[0]
+    own = list(Order.objects.filter(created_by=operator).values_list("pk", flat=True)) or order_ids
+    rng = random.Random(3)
+    fingerprints = fingerprint_payload(2)
+    return [
+        Scenario("orders_list_operator", "get", "/api/orders/", operator),
+        Scenario("orders_list_staff", "get", "/api/orders/?page_size=100", staff),
+        Scenario("orders_list_filtered", "get", "/api/orders/?type=child&ordering=-created_at", staff),
+        Scenario("order_create", "post", "/api/orders/", operator, lambda i: order_payload(rng, fingerprints)),
+        Scenario("order_fingerprints", "get", lambda i: f"/api/orders/{own[i % len(own)]}/fingerprints/", operator),
+        Scenario("order_fingerprints_inline_staff", "get", lambda i: f"/api/orders/{order_ids[i % len(order_ids)]}/fingerprints/?inline=1", staff),
+        Scenario("login", "post", "/api/login/", None, {"username": operator.username, "password": PASSWORD}),
+    ]
+
+
+def _worker(scenario, requests, offset):
+    client = scenario.client()
+    timings, queries, errors = [], 0, 0
+    for i in range(offset, offset + requests):
+        with CaptureQueriesContext(connection) as captured:
+            started = time.perf_counter()
+            response = scenario.request(client, i)
+            timings.append(time.perf_counter() - started)
+        queries += len(captured)
+        if response.status_code >= 400:
+            errors += 1
+    return timings, queries, errors
+
+
+def _threaded_worker(scenario, requests, offset):
+    try:
+        return _worker(scenario, requests, offset)
+    finally:
+        connection.close()
+
+
+def run_load(scenario_list, requests, concurrency=1, only=None):
+    """Drive each scenario through the full middleware/URL/view stack with the test client"""
+    results = {}
+    for scenario in scenario_list:
+        if only and scenario.name not in only:
+            continue
+        per_worker = max(1, requests // concurrency)
+        _worker(scenario, 2, 0)  # warm caches and connections
+        started = time.perf_counter()
+        if concurrency == 1:
+            outcomes = [_worker(scenario, per_worker, 0)]
+        else:
+            with ThreadPoolExecutor(max_workers=concurrency) as pool:
+                outcomes = list(pool.map(lambda n: _threaded_worker(scenario, per_worker, n * per_worker), range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+        timings = [t for outcome in outcomes for t in outcome[0]]
+        results[scenario.name] = summarize(
+            timings, elapsed,
+            queries_per_request=round(sum(o[1] for o in outcomes) / len(timings), 2),
+            errors=sum(o[2] for o in outcomes),
+        )
+    return results
@@ -0,0 +1,95 @@
+import hashlib
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import storages
+from django.utils import timezone
+
+from .models import BlobSweep
+
+
+class FingerprintBlobStore:
+    """Content-addressed store for fingerprint images.
+
+    Blobs are named by the SHA-256 of their bytes, so the same image uploaded
+    for several orders is written once and orders only keep the digest.
+    """
+    prefix = "fingerprints"
+
+    def __init__(self, storage=None, track_sweeps=True):
+        self._storage = storage
+        # processes without database access (the enhancement pool) turn this off
+        self.track_sweeps = track_sweeps
+
+    @property
+    def storage(self):
+        if self._storage is None:
+            return storages[getattr(settings, "FINGERPRINT_STORAGE", "default")]
+        return self._storage
+
+    def path(self, digest):
+        return f"{self.prefix}/{digest[:2]}/{digest}"
+
+    def reprieve(self, digest):
+        """Restart the sweeper's grace period for a queued blob before reusing its stored copy.
+
+        The UPDATE waits while `sweep_queued_blobs` holds the queue row, so the
+        exists() check that follows sees the sweep's outcome and rewrites the
+        file if it was just deleted.
+        """
+        if self.track_sweeps:
+            BlobSweep.objects.filter(digest=digest).update(queued_at=timezone.now())
+
+    def put(self, data):
+        """Store bytes and return their hex digest"""
+        digest = hashlib.sha256(data).hexdigest()
+        name = self.path(digest)
+        self.reprieve(digest)
+        if not self.storage.exists(name):
+            saved = self.storage.save(name, ContentFile(data))
+            if saved != name:
+                # lost a race with another writer of the same content
+                self.storage.delete(saved)
+        return digest
+
+    def put_file(self, file, digest):
+        """Store an already-hashed file (e.g. a temporary upload), streaming its chunks"""
+        name = self.path(digest)
+        self.reprieve(digest)
+        if not self.storage.exists(name):
+            file.seek(0)
+            saved = self.storage.save(name, file)
+            if saved != name:
+                self.storage.delete(saved)
+        return digest
+
+    def open(self, digest):
+        return self.storage.open(self.path(digest), "rb")
+
+    def read(self, digest):
+        with self.open(digest) as f:
+            return f.read()
+
+    def size(self, digest):
+        return self.storage.size(self.path(digest))
+
+    def exists(self, digest):
+        return self.storage.exists(self.path(digest))
+
+    def delete(self, digest):
+        self.storage.delete(self.path(digest))
+
+    def modified_time(self, digest):
+        return self.storage.get_modified_time(self.path(digest))
+
+    def digests(self):
+        """Every stored digest, listed directory by directory"""
+        if not self.storage.exists(self.prefix):
+            return
+        for shard in self.storage.listdir(self.prefix)[0]:
+            for name in self.storage.listdir(f"{self.prefix}/{shard}")[1]:
+                if len(name) == 64 and name.startswith(shard):
+                    yield name
+
+
+blob_store = FingerprintBlobStore()
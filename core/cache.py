@@ -0,0 +1,65 @@
+import hashlib
+import json
+
+from django.core.cache import caches
+
+from .utils import default_enhancer, read_fingerprint
+
+
+def params_fingerprint(params):
+    encoded = json.dumps(params, sort_keys=True, default=str).encode()
+    return hashlib.sha256(encoded).hexdigest()[:16]
+
+
+class TieredCache:
+    """Small in-process LRU in front of a larger shared cache.
+
+    Both tiers are Django caches, so their size bounds and eviction come from
+    MAX_ENTRIES / CULL_FREQUENCY in settings.CACHES.
+    """
+
+    def __init__(self, local_alias, shared_alias):
+        self.local_alias = local_alias
+        self.shared_alias = shared_alias
+
+    @property
+    def local(self):
+        return caches[self.local_alias]
+
+    @property
+    def shared(self):
+        return caches[self.shared_alias]
+
+    def get(self, key):
+        value = self.local.get(key)
+        if value is None:
+            value = self.shared.get(key)
+            if value is not None:
+                self.local.set(key, value)
+        return value
+
+    def set(self, key, value):
+        self.local.set(key, value)
+        self.shared.set(key, value)
+
+    def delete_many(self, keys):
+        self.local.delete_many(keys)
+        self.shared.delete_many(keys)
+
+
+enhanced_cache = TieredCache("fingerprints-local", "fingerprints")
+
+
+def enhanced_cache_key(digest, enhancer=default_enhancer):
+    return f"enhanced:{digest}:{params_fingerprint(enhancer.params)}"
+
+
+def get_enhanced_fingerprint(ref, enhancer=default_enhancer):
+    """Enhanced PNG bytes for a fingerprint reference, computed at most once"""
+    key = enhanced_cache_key(ref["blob"], enhancer)
+    enhanced = enhanced_cache.get(key)
+    if enhanced is None:
+        enhanced = enhancer.enhance(read_fingerprint(ref))
+        enhanced_cache.set(key, enhanced)
+    return enhanced
+
@@ -0,0 +1,58 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db import transaction
+
+from .models import EnhancementJob, Order
+from .stats import STAT_FIELDS, record_orders
+from .sweeper import order_blobs, queue_blob_sweep
+
+DELETE_CHUNK_SIZE = 200
+
+# set while delete_orders runs, so the per-instance pre_delete receiver leaves the work to it
+_bulk_deleting = ContextVar("bulk_deleting", default=False)
+
+
+def bulk_deleting():
+    return _bulk_deleting.get()
+
+
+@contextmanager
+def _deleting_in_bulk():
+    token = _bulk_deleting.set(True)
+    try:
+        yield
+    finally:
+        _bulk_deleting.reset(token)
+
+
+def delete_orders(orders, chunk_size=DELETE_CHUNK_SIZE, limit=None):
+    """Delete the orders an (unsliced) queryset matches, in short transactions.
+
+    Each chunk locks its rows with the queryset's own conditions, so an
+    ownership filter decides what is deleted, then deletes them through the
+    ORM so cascades still apply. Statistics are updated per chunk and the
+    orders' blobs are queued for the sweeper rather than removed inline, since
+    other orders may share them. A failure leaves earlier chunks deleted.
+    Returns the number of orders deleted.
+    """
+    orders = orders.select_related(None).order_by('pk')
+    deleted = 0
+    while limit is None or deleted < limit:
+        size = chunk_size if limit is None else min(chunk_size, limit - deleted)
+        with transaction.atomic(using=orders.db):
+            chunk = list(orders.select_for_update().only('id', 'fingerprints', *STAT_FIELDS)[:size])
+            if not chunk:
+                break
+            ids = [order.pk for order in chunk]
+            results = list(
+                EnhancementJob.objects.filter(order_id__in=ids).exclude(result="").values_list('result', flat=True)
+            )
+            with _deleting_in_bulk():
+                _, per_model = orders.filter(pk__in=ids).only('id').delete()
+            deleted += per_model.get(Order._meta.label, 0)
+            record_orders(chunk, -1)
+            queue_blob_sweep([digest for order in chunk for digest in order_blobs(order.fingerprints)] + results)
+        if len(chunk) < size:
+            break
+    return deleted
@@ -0,0 +1,51 @@
+from datetime import datetime, time, timedelta
+
+import django_filters
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import Order, OrderDailyStat
+
+
+def _start_of_day(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+class OrderFilter(django_filters.FilterSet):
+    """Query-string filters for the order list; each maps onto an Order index"""
+    type = django_filters.ChoiceFilter(field_name='orderType', choices=Order._meta.get_field('orderType').choices)
+    created_after = django_filters.DateFilter(method='filter_created_after')
+    created_before = django_filters.DateFilter(method='filter_created_before')
+    operator = django_filters.NumberFilter(field_name='created_by')
+    search = django_filters.CharFilter(method='filter_search')
+
+    class Meta:
+        model = Order
+        fields = ['district', 'state', 'pincode', 'gender']
+
+    # compare against timestamps rather than created_at__date so the index is usable
+    def filter_created_after(self, queryset, name, value):
+        return queryset.filter(created_at__gte=_start_of_day(value))
+
+    def filter_created_before(self, queryset, name, value):
+        return queryset.filter(created_at__lt=_start_of_day(value + timedelta(days=1)))
+
+    def filter_search(self, queryset, name, value):
+        value = value.strip()
+        if not value:
+            return queryset
+        if value.isdigit():
+            return queryset.filter(Q(aadhaarNumber__startswith=value) | Q(mobileNumber__startswith=value))
+        return queryset.filter(fullName__istartswith=value)
+
+
+class OrderStatFilter(django_filters.FilterSet):
+    """The order list's filters, applied to OrderDailyStat rows"""
+    type = django_filters.ChoiceFilter(field_name='order_type', choices=Order._meta.get_field('orderType').choices)
+    created_after = django_filters.DateFilter(field_name='day', lookup_expr='gte')
+    created_before = django_filters.DateFilter(field_name='day', lookup_expr='lte')
+    operator = django_filters.NumberFilter(field_name='operator')
+
+    class Meta:
+        model = OrderDailyStat
+        fields = ['district', 'state']
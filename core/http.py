@@ -0,0 +1,80 @@
+import re
+
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, quote_etag
+from django.utils.http import http_date, parse_http_date_safe
+
+RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def parse_range(header, size):
+    """(start, end) for a single satisfiable byte range, None to send it all.
+
+    Raises ValueError when the range can't be satisfied. Multi-range
+    requests are answered with the full body, which RFC 9110 allows.
+    """
+    match = RANGE_RE.match(header.strip()) if header else None
+    if not match or match.group(1) == match.group(2) == "":
+        return None
+    first, last = match.groups()
+    if first == "":
+        length = int(last)
+        if length == 0:
+            raise ValueError("empty suffix range")
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise ValueError("range not satisfiable")
+    return start, end
+
+
+def _range_applies(request, etag, last_modified):
+    if_range = request.headers.get("If-Range")
+    if not if_range:
+        return True
+    if if_range.startswith(('"', 'W/')):
+        return if_range == etag
+    since = parse_http_date_safe(if_range)
+    return since is not None and last_modified is not None and since >= int(last_modified)
+
+
+def binary_response(request, get_body, content_type, etag, last_modified=None, cache_control="private, max-age=86400"):
+    """Serve bytes with validators, conditional GET and ranges.
+
+    `get_body` returns the bytes and is only called when the client's cached
+    copy is stale. `last_modified` is a Unix timestamp. Bodies are held in
+    memory: fingerprints are small, and under ASGI a FileResponse's sync
+    iterator would be buffered whole anyway.
+    """
+    etag = quote_etag(etag)
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is not None:
+        response["Cache-Control"] = cache_control
+        return response
+
+    body = get_body()
+    size = len(body)
+
+    try:
+        byte_range = parse_range(request.headers.get("Range"), size) if _range_applies(request, etag, last_modified) else None
+    except ValueError:
+        response = HttpResponse(status=416)
+        response["Content-Range"] = f"bytes */{size}"
+        return response
+
+    if byte_range:
+        start, end = byte_range
+        response = HttpResponse(body[start:end + 1], status=206, content_type=content_type)
+        response["Content-Range"] = f"bytes {start}-{end}/{size}"
+        response["Content-Length"] = str(end - start + 1)
+    else:
+        response = HttpResponse(body, content_type=content_type)
+        response["Content-Length"] = str(size)
+
+    response["Accept-Ranges"] = "bytes"
+    response["ETag"] = etag
+    response["Cache-Control"] = cache_control
+    if last_modified is not None:
+        response["Last-Modified"] = http_date(last_modified)
+    return response
@@ -0,0 +1,102 @@
+from datetime import timedelta
+
+from django.db import transaction
+from django.utils import timezone
+
+from .blobs import FingerprintBlobStore, blob_store
+from .cache import params_fingerprint
+from .models import EnhancementJob
+from .sweeper import queue_blob_sweep
+from .utils import default_enhancer
+
+MAX_ATTEMPTS = 3
+
+
+def _pending_jobs(orders, fingers=None):
+    params = params_fingerprint(default_enhancer.params)
+    return [
+        EnhancementJob(order=order, finger=finger, source=ref["blob"], params=params)
+        for order in orders
+        for finger, ref in (order.fingerprints or {}).items()
+        if isinstance(ref, dict) and ref.get("blob") and (fingers is None or finger in fingers)
+    ]
+
+
+def queue_enhancement(orders, fingers=None):
+    """Create one pending job per stored finger of the given orders (or only `fingers`)"""
+    return EnhancementJob.objects.bulk_create(_pending_jobs(orders, fingers))
+
+
+async def aqueue_enhancement(orders):
+    return await EnhancementJob.objects.abulk_create(_pending_jobs(orders))
+
+
+def _results(order):
+    return (
+        order.enhancement_jobs
+        .filter(status=EnhancementJob.DONE, params=params_fingerprint(default_enhancer.params))
+        .values_list('finger', 'result')
+    )
+
+
+def enhanced_results(order):
+    """{finger: enhanced blob digest} for finished jobs of the current params"""
+    return dict(_results(order))
+
+
+async def aenhanced_results(order):
+    return {finger: result async for finger, result in _results(order)}
+
+
+def claim_jobs(limit):
+    """Mark up to `limit` pending jobs as running and return (id, source) pairs"""
+    with transaction.atomic():
+        claimed = list(
+            EnhancementJob.objects
+            .select_for_update(skip_locked=True)
+            .filter(status=EnhancementJob.PENDING)
+            .order_by('id')
+            .values_list('id', 'source')[:limit]
+        )
+        if claimed:
+            EnhancementJob.objects.filter(id__in=[job_id for job_id, _ in claimed]).update(
+                status=EnhancementJob.RUNNING, updated_at=timezone.now(),
+            )
+    return claimed
+
+
+def requeue_stale_jobs(older_than=timedelta(minutes=10)):
+    """Give jobs left running by a dead worker back to the queue"""
+    return EnhancementJob.objects.filter(
+        status=EnhancementJob.RUNNING, updated_at__lt=timezone.now() - older_than,
+    ).update(status=EnhancementJob.PENDING)
+
+
+# enhance_blob runs in pool processes, which never touch the database
+_pool_blob_store = FingerprintBlobStore(track_sweeps=False)
+
+
+def enhance_blob(source):
+    """Worker-process entry point: enhance a stored image, store the result"""
+    return _pool_blob_store.put(default_enhancer.enhance(_pool_blob_store.read(source)))
+
+
+def finish_job(job_id, result=None, error=None):
+    try:
+        job = EnhancementJob.objects.get(pk=job_id)
+    except EnhancementJob.DoesNotExist:
+        # the order was deleted while this finger was being enhanced
+        queue_blob_sweep([result])
+        return
+    job.attempts += 1
+    if error is None:
+        # the pool may have reused a stored copy the sweeper was removing; recompute if so
+        blob_store.reprieve(result)
+        if not blob_store.exists(result):
+            error = "Result was swept before it was recorded"
+    if error is None:
+        job.status, job.result, job.error = EnhancementJob.DONE, result, ""
+    else:
+        job.status = EnhancementJob.FAILED if job.attempts >= MAX_ATTEMPTS else EnhancementJob.PENDING
+        job.error = error
+    job.save(update_fields=['status', 'result', 'error', 'attempts', 'updated_at'])
@@ -0,0 +1,138 @@
+import random
+import statistics
+import time
+from contextlib import contextmanager
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from core.models import Order
+
+ORDER_TYPES = ['mobile', 'child', 'demographics']
+BENCH_PREFIX = 'bench_operator_'
+NAME_PREFIX_INDEX = 'core_order_name_prefix_idx'
+NAME_PREFIX_INDEX_SQL = 'CREATE INDEX "core_order_name_prefix_idx" ON "core_order" (UPPER("fullName") text_pattern_ops)'
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed synthetic orders into a test database and report query plans and "
+        "latency of the order lookups, with and without indexes"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--orders', type=int, default=1_000_000, help="Orders to seed (0 to reuse a --keepdb database)")
+        parser.add_argument('--operators', type=int, default=50)
+        parser.add_argument('--batch', type=int, default=10_000)
+        parser.add_argument('--repeat', type=int, default=20, help="Timed runs per query")
+        parser.add_argument('--compare', action='store_true', help="Also measure with the Order indexes dropped")
+        parser.add_argument('--cleanup', action='store_true', help="Delete the seeded operators and orders afterwards")
+        parser.add_argument('--keepdb', action='store_true', help="Keep the test database, and its seeded orders, between runs")
+
+    def handle(self, *args, **options):
+        # seeding and dropping indexes happen in a throwaway test database, never the configured one
+        old_name = connection.settings_dict['NAME']
+        setup_test_environment()
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, keepdb=options['keepdb'])
+        try:
+            self.measure(options)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=options['keepdb'])
+            teardown_test_environment()
+
+    def measure(self, options):
+        operators = self.seed_operators(options['operators'])
+        if options['orders']:
+            self.seed_orders(operators, options['orders'], options['batch'])
+
+        sample = Order.objects.filter(created_by__in=operators).values('aadhaarNumber', 'mobileNumber').first() or {}
+        queries = self.queries(operators[0], sample)
+
+        if options['compare']:
+            self.stdout.write(self.style.MIGRATE_HEADING("Without indexes"))
+            with self.indexes_dropped():
+                self.report(queries, options['repeat'])
+
+        self.stdout.write(self.style.MIGRATE_HEADING("With indexes"))
+        self.report(queries, options['repeat'])
+
+        if options['cleanup']:
+            User.objects.filter(username__startswith=BENCH_PREFIX).delete()
+
+    def seed_operators(self, count):
+        existing = list(User.objects.filter(username__startswith=BENCH_PREFIX))
+        missing = [User(username=f"{BENCH_PREFIX}{i}") for i in range(len(existing), count)]
+        return existing + User.objects.bulk_create(missing)
+
+    def seed_orders(self, operators, count, batch):
+        rng = random.Random(42)
+        created = 0
+        started = time.perf_counter()
+        while created < count:
+            size = min(batch, count - created)
+            Order.objects.bulk_create([
+                Order(
+                    created_by=rng.choice(operators),
+                    orderType=rng.choice(ORDER_TYPES),
+                    fullName=f"Bench {created + i}",
+                    aadhaarNumber=f"{rng.randrange(10**11, 10**12)}",
+                    mobileNumber=f"9{rng.randrange(10**8, 10**9)}",
+                    district=f"District {rng.randrange(700)}",
+                    state=f"State {rng.randrange(36)}",
+                    pincode=f"{rng.randrange(100000, 999999)}",
+                )
+                for i in range(size)
+            ], batch_size=batch)
+            created += size
+            self.stdout.write(f"Seeded {created}/{count} orders", ending="\r")
+        self.stdout.write(f"Seeded {count} orders in {time.perf_counter() - started:.1f}s")
+
+    def queries(self, operator, sample):
+        page = 51
+        return {
+            'operator list': Order.objects.summary().filter(created_by=operator).order_by('-created_at', '-id')[:page],
+            'operator list by type': Order.objects.summary().filter(created_by=operator, orderType='child').order_by('-created_at', '-id')[:page],
+            'staff list': Order.objects.summary().order_by('-created_at', '-id')[:page],
+            'staff list by type': Order.objects.summary().filter(orderType='mobile').order_by('-created_at', '-id')[:page],
+            'aadhaar lookup': Order.objects.summary().filter(aadhaarNumber=sample.get('aadhaarNumber', '')),
+            'mobile lookup': Order.objects.summary().filter(mobileNumber=sample.get('mobileNumber', '')),
+        }
+
+    def report(self, queries, repeat):
+        for name, queryset in queries.items():
+            timings = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                list(queryset.all())
+                timings.append((time.perf_counter() - started) * 1000)
+            timings.sort()
+            p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+            self.stdout.write(self.style.SUCCESS(
+                f"{name}: median {statistics.median(timings):.2f} ms, p95 {p95:.2f} ms"
+            ))
+            self.stdout.write(queryset.all().explain())
+
+    @contextmanager
+    def indexes_dropped(self):
+        with connection.schema_editor() as editor:
+            for index in Order._meta.indexes:
+                editor.remove_index(Order, index)
+        self.analyze()
+        try:
+            yield
+        finally:
+            with connection.schema_editor() as editor:
+                for index in Order._meta.indexes:
+                    if index.name == NAME_PREFIX_INDEX and connection.vendor == 'postgresql':
+                        # the model can't express its pattern ops; same SQL as migration 0019
+                        editor.execute(NAME_PREFIX_INDEX_SQL)
+                    else:
+                        editor.add_index(Order, index)
+            self.analyze()
+
+    def analyze(self):
+        # refresh planner statistics so plans reflect the current index set
+        with connection.cursor() as cursor:
+            cursor.execute(f"ANALYZE {connection.ops.quote_name(Order._meta.db_table)}")
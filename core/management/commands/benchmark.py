@@ -0,0 +1,109 @@
+import json
+import platform
+import tempfile
+from pathlib import Path
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings, setup_test_environment, teardown_test_environment
+from django.utils import timezone
+
+from core.benchmarks.compare import compare
+from core.benchmarks.data import seed
+from core.benchmarks.runner import run_load, run_micro, scenarios
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a throwaway test database and report micro-benchmark and HTTP load "
+        "latencies (p50/p95/p99), throughput and query counts as JSON"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--orders', type=int, default=500, help="Orders to seed")
+        parser.add_argument('--operators', type=int, default=5)
+        parser.add_argument('--iterations', type=int, default=200, help="Calls per micro-benchmark")
+        parser.add_argument('--requests', type=int, default=100, help="Requests per load scenario")
+        parser.add_argument('--concurrency', type=int, default=1, help="Client threads per load scenario")
+        parser.add_argument('--scenario', action='append', dest='scenarios', help="Only run these load scenarios")
+        parser.add_argument('--skip-micro', action='store_true')
+        parser.add_argument('--skip-load', action='store_true')
+        parser.add_argument('--output', help="Write the JSON report here instead of stdout")
+        parser.add_argument('--baseline', help="Compare against a previous JSON report")
+        parser.add_argument('--save-baseline', help="Also write the report here, as the new baseline")
+        parser.add_argument('--tolerance', type=float, default=0.2, help="Allowed latency growth over the baseline (fraction)")
+        parser.add_argument('--fail-on-regression', action='store_true', help="Exit non-zero if anything regressed")
+        parser.add_argument('--keepdb', action='store_true', help="Keep the test database between runs")
+
+    def handle(self, *args, **options):
+        baseline = None
+        if options['baseline']:
+            try:
+                baseline = json.loads(Path(options['baseline']).read_text())
+            except (OSError, ValueError) as e:
+                raise CommandError(f"Could not read baseline: {e}")
+
+        report = self.run(options)
+        encoded = json.dumps(report, indent=2)
+        if options['output']:
+            Path(options['output']).write_text(encoded)
+        else:
+            self.stdout.write(encoded)
+        if options['save_baseline']:
+            Path(options['save_baseline']).write_text(encoded)
+
+        if baseline is not None:
+            regressions = compare(report, baseline, options['tolerance'])
+            for name, metric, before, after in regressions:
+                self.stderr.write(self.style.ERROR(f"{name} {metric}: {before} -> {after}"))
+            if not regressions:
+                self.stderr.write(self.style.SUCCESS("No regressions against the baseline"))
+            elif options['fail_on_regression']:
+                raise CommandError(f"{len(regressions)} metric(s) regressed")
+
+    def run(self, options):
+        # a test database plus temporary media and cache dirs, so real data is never touched
+        with tempfile.TemporaryDirectory(prefix="benchmark-") as scratch:
+            caches = {alias: dict(config) for alias, config in settings.CACHES.items()}
+            for alias in ('fingerprints', 'sessions', 'revoked-tokens'):
+                caches[alias]['LOCATION'] = str(Path(scratch) / 'cache' / alias)
+            # buckets that never empty: the login scenario measures password hashing, not 429s
+            caches['throttle'] = {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}
+            old_name = connection.settings_dict['NAME']
+            setup_test_environment()
+            connection.creation.create_test_db(verbosity=0, autoclobber=True, keepdb=options['keepdb'])
+            try:
+                with override_settings(MEDIA_ROOT=str(Path(scratch) / 'media'), CACHES=caches):
+                    return self.measure(options)
+            finally:
+                connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=options['keepdb'])
+                teardown_test_environment()
+
+    def measure(self, options):
+        self.stderr.write(f"Seeding {options['orders']} orders...")
+        staff, operators, order_ids = seed(operators=options['operators'], orders=options['orders'])
+
+        report = {
+            'meta': {
+                'timestamp': timezone.now().isoformat(),
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'database': connection.vendor,
+                'orders': options['orders'],
+                'iterations': options['iterations'],
+                'requests': options['requests'],
+                'concurrency': options['concurrency'],
+            },
+        }
+        if not options['skip_micro']:
+            self.stderr.write("Running micro-benchmarks...")
+            report['micro'] = run_micro(options['iterations'])
+        if not options['skip_load']:
+            self.stderr.write("Running load scenarios...")
+            report['load'] = run_load(
+                scenarios(staff, operators, order_ids), options['requests'],
+                concurrency=options['concurrency'], only=options['scenarios'],
+            )
+        return report
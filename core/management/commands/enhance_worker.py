@@ -0,0 +1,63 @@
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.jobs import claim_jobs, enhance_blob, finish_job, requeue_stale_jobs
+from core.sweeper import sweep_queued_blobs
+
+
+class Command(BaseCommand):
+    help = "Process queued fingerprint enhancement jobs with a pool of worker processes"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--processes', type=int, default=os.cpu_count() or 1)
+        parser.add_argument('--batch', type=int, default=20, help="Jobs claimed per round")
+        parser.add_argument('--poll-interval', type=float, default=2.0, help="Seconds to sleep when the queue is empty")
+        parser.add_argument('--once', action='store_true', help="Exit once the queue is empty")
+        parser.add_argument(
+            '--sweep-interval', type=float, default=settings.BLOB_SWEEP_INTERVAL_SECONDS,
+            help="Seconds between sweeps of blobs left unused by deleted orders (0 to disable)",
+        )
+
+    def handle(self, *args, **options):
+        # spawned whatever the platform default (forkserver from Python 3.14), and
+        # set up before the first job, since unpickling enhance_blob imports core.jobs
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=options['processes'], mp_context=context, initializer=django.setup) as pool:
+            self.stdout.write(f"Enhancement worker started with {options['processes']} processes")
+            next_sweep = time.monotonic()
+            while True:
+                if options['sweep_interval'] and time.monotonic() >= next_sweep:
+                    self.sweep()
+                    next_sweep = time.monotonic() + options['sweep_interval']
+                requeue_stale_jobs()
+                claimed = claim_jobs(options['batch'])
+                if not claimed:
+                    if options['once']:
+                        break
+                    time.sleep(options['poll_interval'])
+                    continue
+
+                futures = [(job_id, pool.submit(enhance_blob, source)) for job_id, source in claimed]
+                for job_id, future in futures:
+                    try:
+                        finish_job(job_id, result=future.result())
+                    except Exception as e:
+                        finish_job(job_id, error=str(e))
+                        self.stderr.write(f"Job {job_id} failed: {e}")
+                self.stdout.write(f"Processed {len(claimed)} jobs")
+
+    def sweep(self):
+        try:
+            checked, deleted = sweep_queued_blobs()
+        except Exception as e:
+            # enhancement carries on; the queue is retried at the next interval
+            self.stderr.write(f"Blob sweep failed: {e}")
+            return
+        if checked:
+            self.stdout.write(f"Swept {checked} queued blobs, deleted {deleted}")
@@ -0,0 +1,59 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from core.blobs import blob_store
+from core.jobs import queue_enhancement
+from core.models import Order
+from core.sweeper import queue_blob_sweep
+from core.utils import store_fingerprint_image
+
+
+class Command(BaseCommand):
+    help = "Re-encode fingerprints stored before ingest normalization as lossless 8-bit grayscale"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=200)
+
+    def handle(self, *args, **options):
+        orders = updated = before = after = 0
+        for order in Order.objects.only('id', 'fingerprints').iterator(chunk_size=options['chunk_size']):
+            orders += 1
+            replaced = {}
+            refs = dict(order.fingerprints or {})
+            for finger, ref in refs.items():
+                if not (isinstance(ref, dict) and ref.get('blob')) or 'original_size' in ref:
+                    continue
+                try:
+                    normalized = store_fingerprint_image(blob_store.read(ref['blob']))
+                except (OSError, ValueError) as e:
+                    self.stderr.write(f"Order {order.pk} {finger}: {e}")
+                    continue
+                before += normalized.get('original_size', normalized['size'])
+                after += normalized['size']
+                refs[finger] = {**ref, **normalized}
+                if normalized['blob'] != ref['blob']:
+                    replaced[finger] = ref['blob']
+            if refs != order.fingerprints:
+                with transaction.atomic():
+                    order.fingerprints = refs
+                    order.save(update_fields=['fingerprints'])
+                    if replaced:
+                        self.replace_jobs(order, replaced)
+                updated += 1
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Normalized {updated} of {orders} orders: {before} -> {after} bytes"
+        ))
+
+    def replace_jobs(self, order, replaced):
+        """Re-enhance fingers whose blob changed and hand the old blobs to the sweeper.
+
+        Old results were computed from the old images, so they would be served
+        under the new images' ETags; they are deleted and re-queued.
+        """
+        jobs = order.enhancement_jobs.filter(finger__in=replaced)
+        requeue = set(jobs.values_list('finger', flat=True))
+        results = list(jobs.exclude(result="").values_list('result', flat=True))
+        jobs.delete()
+        queue_enhancement([order], fingers=requeue)
+        queue_blob_sweep([*replaced.values(), *results])
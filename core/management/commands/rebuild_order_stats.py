@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from core.models import OrderDailyStat
+from core.stats import rebuild_order_stats
+
+
+class Command(BaseCommand):
+    help = "Recompute the per-day order statistics from the orders table"
+
+    def handle(self, *args, **options):
+        rebuild_order_stats()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {OrderDailyStat.objects.count()} statistics rows"))
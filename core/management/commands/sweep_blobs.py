@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from core.sweeper import queue_unreferenced_blobs, sweep_queued_blobs
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete fingerprint blobs (and their cached enhancements) no longer used by any order; "
+        "enhance_worker already sweeps the queue periodically, so this is for one-off or --all runs"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--grace', type=int, help="Seconds a blob must have been unused (default BLOB_SWEEP_GRACE_SECONDS)")
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument(
+            '--all', action='store_true',
+            help="Also queue every unreferenced stored blob, not just those left by deletions; they go after one more grace period",
+        )
+        parser.add_argument('--dry-run', action='store_true', help="Report without deleting")
+
+    def handle(self, *args, **options):
+        if options['all'] and not options['dry_run']:
+            checked, queued = queue_unreferenced_blobs(grace=options['grace'], batch_size=options['batch_size'])
+            self.stdout.write(f"Checked {checked} stored blobs. Queued {queued} unreferenced ones.")
+        checked, deleted = sweep_queued_blobs(grace=options['grace'], batch_size=options['batch_size'], dry_run=options['dry_run'])
+        verb = "Would delete" if options['dry_run'] else "Deleted"
+        self.stdout.write(self.style.SUCCESS(f"Checked {checked} queued blobs. {verb} {deleted}."))
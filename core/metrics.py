@@ -0,0 +1,170 @@
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# per-request accumulator; unset outside requests (e.g. in the enhancement worker)
+_current = ContextVar("request_metrics", default=None)
+
+
+class RequestMetrics:
+    """What one request spent its time on.
+
+    Shared by every thread the request fans out to (enhancement pool,
+    sync_to_async), hence the lock.
+    """
+
+    def __init__(self):
+        self.db_queries = 0
+        self.db_seconds = 0.0
+        self.timings = {}
+        self._lock = threading.Lock()
+
+    def add_query(self, seconds):
+        with self._lock:
+            self.db_queries += 1
+            self.db_seconds += seconds
+
+    def add(self, name, seconds):
+        with self._lock:
+            self.timings[name] = self.timings.get(name, 0.0) + seconds
+
+
+def start_request():
+    metrics = RequestMetrics()
+    return metrics, _current.set(metrics)
+
+
+def end_request(token):
+    _current.reset(token)
+
+
+@contextmanager
+def timed(name):
+    """Add the duration of the block to the current request's `name` timing"""
+    metrics = _current.get()
+    if metrics is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.add(name, time.perf_counter() - started)
+
+
+def record_query(execute, sql, params, many, context):
+    """connection.execute_wrapper hook counting queries against the current request"""
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.add_query(time.perf_counter() - started)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names, values, extra=""):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Histogram:
+    """Cumulative Prometheus-style histogram, one series per label set"""
+    kind = "histogram"
+
+    def __init__(self, name, help, labels, buckets):
+        self.name, self.help, self.labels = name, help, labels
+        self.buckets = tuple(sorted(buckets))
+        self.series = {}
+
+    def observe(self, labels, value):
+        counts = self.series.get(labels)
+        if counts is None:
+            # one count per bucket plus +Inf, then sum
+            counts = self.series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        counts[bisect_left(self.buckets, value)] += 1
+        counts[-1] += value
+
+    def samples(self):
+        for labels, counts in sorted(self.series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), counts):
+                cumulative += count
+                le = 'le="%s"' % (bound if bound == "+Inf" else _number(bound))
+                yield f"{self.name}_bucket{_labels(self.labels, labels, le)} {cumulative}"
+            yield f"{self.name}_sum{_labels(self.labels, labels)} {_number(counts[-1])}"
+            yield f"{self.name}_count{_labels(self.labels, labels)} {cumulative}"
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name, help, labels):
+        self.name, self.help, self.labels = name, help, labels
+        self.series = {}
+
+    def observe(self, labels, value=1):
+        self.series[labels] = self.series.get(labels, 0) + value
+
+    def samples(self):
+        for labels, value in sorted(self.series.items()):
+            yield f"{self.name}{_labels(self.labels, labels)} {_number(value)}"
+
+
+class Registry:
+    """In-process metrics, rendered in the Prometheus text format.
+
+    Values are per process: under several gunicorn workers each one reports
+    its own, so scrape them individually or sum in Prometheus.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.metrics = {}
+
+    def register(self, metric):
+        self.metrics[metric.name] = metric
+        return metric
+
+    def observe(self, name, labels, value=1):
+        with self._lock:
+            self.metrics[name].observe(labels, value)
+
+    def render(self):
+        lines = []
+        with self._lock:
+            for metric in self.metrics.values():
+                lines.append(f"# HELP {metric.name} {metric.help}")
+                lines.append(f"# TYPE {metric.name} {metric.kind}")
+                lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+VIEW_LABELS = ("view", "method")
+
+registry = Registry()
+registry.register(Counter("http_requests_total", "Requests by view, method and status", VIEW_LABELS + ("status",)))
+registry.register(Histogram(
+    "http_request_duration_seconds", "Wall time from the first middleware to the response", VIEW_LABELS,
+    (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+))
+registry.register(Histogram(
+    "http_request_db_queries", "Database queries per request; a high tail usually means N+1", VIEW_LABELS,
+    (0, 1, 2, 5, 10, 20, 50, 100),
+))
+registry.register(Counter("http_request_db_seconds_total", "Time spent in database queries", VIEW_LABELS))
+registry.register(Counter("http_response_bytes_total", "Response body bytes, where the length is known", VIEW_LABELS))
+registry.register(Counter("http_request_enhance_seconds_total", "Time spent enhancing fingerprints", VIEW_LABELS))
@@ -0,0 +1,88 @@
+import logging
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+from . import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class PerformanceMiddleware:
+    """Per-view wall time, DB queries, response bytes and enhancement time.
+
+    Adds a Server-Timing header, feeds the histograms in core.metrics and logs
+    slow or query-heavy requests. Queries are counted by metrics.record_query,
+    which core.signals installs on every database connection. Works in both
+    the WSGI and ASGI handlers, so it doesn't push async views onto a thread.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        started = time.perf_counter()
+        request_metrics, token = metrics.start_request()
+        try:
+            response = self.get_response(request)
+        finally:
+            metrics.end_request(token)
+        self.record(request, response, request_metrics, time.perf_counter() - started)
+        return response
+
+    async def __acall__(self, request):
+        started = time.perf_counter()
+        request_metrics, token = metrics.start_request()
+        try:
+            response = await self.get_response(request)
+        finally:
+            metrics.end_request(token)
+        self.record(request, response, request_metrics, time.perf_counter() - started)
+        return response
+
+    def record(self, request, response, request_metrics, elapsed):
+        match = getattr(request, "resolver_match", None)
+        labels = (match.view_name if match else "unresolved", request.method)
+        enhance = request_metrics.timings.get("enhance", 0.0)
+        size = self.response_size(response)
+
+        metrics.registry.observe("http_requests_total", labels + (str(response.status_code),))
+        metrics.registry.observe("http_request_duration_seconds", labels, elapsed)
+        metrics.registry.observe("http_request_db_queries", labels, request_metrics.db_queries)
+        metrics.registry.observe("http_request_db_seconds_total", labels, request_metrics.db_seconds)
+        metrics.registry.observe("http_request_enhance_seconds_total", labels, enhance)
+        if size is not None:
+            metrics.registry.observe("http_response_bytes_total", labels, size)
+
+        if getattr(settings, "PERFORMANCE_SERVER_TIMING", True):
+            parts = [
+                f"app;dur={elapsed * 1000:.1f}",
+                f'db;dur={request_metrics.db_seconds * 1000:.1f};desc="{request_metrics.db_queries} queries"',
+            ]
+            if enhance:
+                parts.append(f"enhance;dur={enhance * 1000:.1f}")
+            response.headers["Server-Timing"] = ", ".join(parts)
+
+        slow_ms = getattr(settings, "PERFORMANCE_SLOW_REQUEST_MS", 1000)
+        max_queries = getattr(settings, "PERFORMANCE_MAX_QUERIES", 20)
+        if elapsed * 1000 > slow_ms or request_metrics.db_queries > max_queries:
+            logger.warning(
+                "Slow request %s %s (%s): %.0f ms, %d queries in %.0f ms, enhance %.0f ms",
+                request.method, request.path, labels[0], elapsed * 1000,
+                request_metrics.db_queries, request_metrics.db_seconds * 1000, enhance * 1000,
+            )
+
+    @staticmethod
+    def response_size(response):
+        if response.has_header("Content-Length"):
+            return int(response["Content-Length"])
+        if not response.streaming:
+            return len(response.content)
+        return None
@@ -0,0 +1,84 @@
+import base64
+import hashlib
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import storages
+from django.db import migrations
+
+
+def _storage():
+    return storages[getattr(settings, 'FINGERPRINT_STORAGE', 'default')]
+
+
+def _blob_path(digest):
+    return f"fingerprints/{digest[:2]}/{digest}"
+
+
+def _content_type(raw):
+    if raw.startswith(b"\x89PNG"):
+        return "image/png"
+    if raw.startswith(b"\xff\xd8\xff"):
+        return "image/jpeg"
+    if raw.startswith(b"BM"):
+        return "image/bmp"
+    if raw[:4] == b"RIFF" and raw[8:12] == b"WEBP":
+        return "image/webp"
+    return "application/octet-stream"
+
+
+def move_to_blob_store(apps, schema_editor):
+    Order = apps.get_model('core', 'Order')
+    storage = _storage()
+
+    orders = Order.objects.only('id', 'fingerprints').iterator(chunk_size=100)
+    for order in orders:
+        changed = False
+        refs = {}
+        for finger, value in (order.fingerprints or {}).items():
+            if isinstance(value, dict) and value.get('BitmapData'):
+                raw = base64.b64decode(value['BitmapData'])
+                digest = hashlib.sha256(raw).hexdigest()
+                if not storage.exists(_blob_path(digest)):
+                    storage.save(_blob_path(digest), ContentFile(raw))
+                meta = {k: v for k, v in value.items() if k != 'BitmapData'}
+                refs[finger] = {**meta, 'blob': digest, 'content_type': _content_type(raw), 'size': len(raw)}
+                changed = True
+            else:
+                refs[finger] = value
+        if changed:
+            order.fingerprints = refs
+            order.save(update_fields=['fingerprints'])
+
+
+def restore_from_blob_store(apps, schema_editor):
+    Order = apps.get_model('core', 'Order')
+    storage = _storage()
+
+    orders = Order.objects.only('id', 'fingerprints').iterator(chunk_size=100)
+    for order in orders:
+        changed = False
+        inflated = {}
+        for finger, value in (order.fingerprints or {}).items():
+            if isinstance(value, dict) and value.get('blob'):
+                with storage.open(_blob_path(value['blob']), 'rb') as f:
+                    raw = f.read()
+                meta = {k: v for k, v in value.items() if k not in ('blob', 'content_type', 'size')}
+                inflated[finger] = {**meta, 'BitmapData': base64.b64encode(raw).decode('ascii')}
+                changed = True
+            else:
+                inflated[finger] = value
+        if changed:
+            order.fingerprints = inflated
+            order.save(update_fields=['fingerprints'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0015_order_district_order_landmark_order_pincode_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(move_to_blob_store, restore_from_blob_store),
+    ]
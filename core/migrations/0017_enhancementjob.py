@@ -0,0 +1,33 @@
+# Generated by Django 5.2.4 on 2026-10-18 07:07
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0016_move_fingerprints_to_blob_store'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EnhancementJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('finger', models.CharField(max_length=50)),
+                ('source', models.CharField(max_length=64)),
+                ('params', models.CharField(max_length=16)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('done', 'Done'), ('failed', 'Failed')], default='pending', max_length=10)),
+                ('result', models.CharField(blank=True, default='', max_length=64)),
+                ('error', models.TextField(blank=True, default='')),
+                ('attempts', models.PositiveSmallIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('order', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='enhancement_jobs', to='core.order')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['status', 'id'], name='core_job_status_idx')],
+            },
+        ),
+    ]
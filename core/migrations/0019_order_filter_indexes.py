@@ -0,0 +1,75 @@
+# Generated by Django 5.2.4 on 2026-10-18 07:12
+
+import django.db.models.functions.text
+from django.conf import settings
+from django.db import migrations, models
+
+
+NAME_PREFIX_INDEX = models.Index(django.db.models.functions.text.Upper('fullName'), name='core_order_name_prefix_idx')
+
+
+def create_name_prefix_index(apps, schema_editor):
+    Order = apps.get_model('core', 'Order')
+    if schema_editor.connection.vendor == 'postgresql':
+        # istartswith compiles to UPPER(col) LIKE 'X%', which needs pattern ops
+        # to use an index under a non-C collation
+        schema_editor.execute(
+            'CREATE INDEX "core_order_name_prefix_idx" ON "core_order" (UPPER("fullName") text_pattern_ops)'
+        )
+    else:
+        schema_editor.add_index(Order, NAME_PREFIX_INDEX)
+
+
+def drop_name_prefix_index(apps, schema_editor):
+    Order = apps.get_model('core', 'Order')
+    schema_editor.remove_index(Order, NAME_PREFIX_INDEX)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0018_order_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='order',
+            name='core_order_aadhaar_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='order',
+            name='core_order_mobile_idx',
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['aadhaarNumber'], name='core_order_aadhaar_prefix_idx', opclasses=['varchar_pattern_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['mobileNumber'], name='core_order_mobile_prefix_idx', opclasses=['varchar_pattern_ops']),
+        ),
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AddIndex(
+                    model_name='order',
+                    index=models.Index(django.db.models.functions.text.Upper('fullName'), name='core_order_name_prefix_idx'),
+                ),
+            ],
+            database_operations=[
+                migrations.RunPython(create_name_prefix_index, drop_name_prefix_index),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['district', 'created_at', 'id'], name='core_order_district_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['state', 'created_at', 'id'], name='core_order_state_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['pincode', 'created_at', 'id'], name='core_order_pincode_idx'),
+        ),
+    ]
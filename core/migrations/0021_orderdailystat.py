@@ -0,0 +1,57 @@
+# Generated by Django 5.2.4 on 2026-10-18 07:29
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+
+
+def fill_order_stats(apps, schema_editor):
+    Order = apps.get_model('core', 'Order')
+    OrderDailyStat = apps.get_model('core', 'OrderDailyStat')
+    groups = (
+        Order.objects
+        .annotate(day=TruncDate('created_at'))
+        .values('day', 'orderType', 'created_by', 'district', 'state')
+        .annotate(n=Count('id'))
+        .order_by()
+    )
+    OrderDailyStat.objects.bulk_create(
+        [
+            OrderDailyStat(
+                day=row['day'], order_type=row['orderType'], operator_id=row['created_by'],
+                district=row['district'] or '', state=row['state'] or '', count=row['n'],
+            )
+            for row in groups.iterator(chunk_size=2000)
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0020_order_idempotencykey'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OrderDailyStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('order_type', models.CharField(max_length=20)),
+                ('district', models.CharField(blank=True, default='', max_length=100)),
+                ('state', models.CharField(blank=True, default='', max_length=100)),
+                ('count', models.IntegerField(default=0)),
+                ('operator', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='order_stats', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['operator', 'day'], name='core_orderstat_operator_idx')],
+                'constraints': [models.UniqueConstraint(fields=('day', 'order_type', 'operator', 'district', 'state'), name='core_orderstat_group')],
+            },
+        ),
+        migrations.RunPython(fill_order_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.4 on 2026-10-18 07:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0021_orderdailystat'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BlobSweep',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('digest', models.CharField(max_length=64, unique=True)),
+                ('queued_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['queued_at'], name='core_blobsweep_queued_idx')],
+            },
+        ),
+    ]
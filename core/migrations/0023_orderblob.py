@@ -0,0 +1,55 @@
+# Generated by Django 5.2.4 on 2026-10-18 08:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def fill_order_blobs(apps, schema_editor):
+    Order = apps.get_model('core', 'Order')
+    OrderBlob = apps.get_model('core', 'OrderBlob')
+    batch = []
+    for order_id, fingerprints in Order.objects.values_list('id', 'fingerprints').iterator(chunk_size=2000):
+        digests = {
+            ref['blob'] for ref in (fingerprints or {}).values()
+            if isinstance(ref, dict) and ref.get('blob')
+        }
+        batch.extend(OrderBlob(order_id=order_id, digest=digest) for digest in digests)
+        if len(batch) >= 1000:
+            OrderBlob.objects.bulk_create(batch)
+            batch = []
+    OrderBlob.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0022_blobsweep'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OrderBlob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('digest', models.CharField(max_length=64)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='enhancementjob',
+            index=models.Index(fields=['source'], name='core_job_source_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='enhancementjob',
+            index=models.Index(fields=['result'], name='core_job_result_idx'),
+        ),
+        migrations.AddField(
+            model_name='orderblob',
+            name='order',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='blob_refs', to='core.order'),
+        ),
+        migrations.AddIndex(
+            model_name='orderblob',
+            index=models.Index(fields=['digest'], name='core_orderblob_digest_idx'),
+        ),
+        migrations.RunPython(fill_order_blobs, migrations.RunPython.noop),
+    ]
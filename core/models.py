@@ -1,5 +1,24 @@
 from django.db import models
 from django.conf import settings
+from django.db.models.functions import Upper
+
+
+class OrderQuerySet(models.QuerySet):
+    """Named projections so the heavy JSON columns are only read when needed"""
+    heavy_fields = ('fingerprints', 'formData')
+
+    def summary(self):
+        """List rows: scalar columns plus the operator, no JSON blobs"""
+        return self.select_related('created_by').defer(*self.heavy_fields)
+
+    def refs(self):
+        """Ownership plus fingerprint references, for serving images"""
+        return self.only('id', 'created_by', 'created_at', 'fingerprints')
+
+    def full(self):
+        """Everything, for the detail view"""
+        return self.select_related('created_by')
+
 
 class Order(models.Model):
     created_by = models.ForeignKey(settings.AUTH_USER_MODEL,on_delete=models.CASCADE, related_name='orders', null=True, blank=True)
@@ -31,7 +50,132 @@ class Order(models.Model):
 
     fingerprints = models.JSONField(default=dict)
 
+    # client-chosen key so a retried sync doesn't create the order twice
+    idempotencyKey = models.CharField(max_length=64, null=True, blank=True)
+
     created_at = models.DateTimeField(auto_now_add=True)
 
+    objects = OrderQuerySet.as_manager()
+
+    class Meta:
+        # listings filter by operator and/or type and page on (created_at, id)
+        indexes = [
+            models.Index(fields=['created_by', 'orderType', 'created_at', 'id'], name='core_order_owner_type_idx'),
+            models.Index(fields=['created_by', 'created_at', 'id'], name='core_order_owner_created_idx'),
+            models.Index(fields=['orderType', 'created_at', 'id'], name='core_order_type_created_idx'),
+            models.Index(fields=['created_at', 'id'], name='core_order_created_idx'),
+            # pattern ops let PostgreSQL use these for prefix search as well as equality
+            models.Index(fields=['aadhaarNumber'], name='core_order_aadhaar_prefix_idx', opclasses=['varchar_pattern_ops']),
+            models.Index(fields=['mobileNumber'], name='core_order_mobile_prefix_idx', opclasses=['varchar_pattern_ops']),
+            # created with text_pattern_ops on PostgreSQL, see migration 0019
+            models.Index(Upper('fullName'), name='core_order_name_prefix_idx'),
+            models.Index(fields=['district', 'created_at', 'id'], name='core_order_district_idx'),
+            models.Index(fields=['state', 'created_at', 'id'], name='core_order_state_idx'),
+            models.Index(fields=['pincode', 'created_at', 'id'], name='core_order_pincode_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['created_by', 'idempotencyKey'], name='core_order_idempotency_key'),
+        ]
+
+    def __str__(self):
+        return f"Order {self.orderType} for {self.fullName}"
+
+    @property
+    def application_id(self):
+        """Stable reference shown to applicants, derived from the primary key"""
+        return f"APP_{self.orderType.upper()}_{self.pk:08d}"
+
+
+class EnhancementJob(models.Model):
+    """Background enhancement of one finger, picked up by `manage.py enhance_worker`"""
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (PENDING, 'Pending'),
+        (RUNNING, 'Running'),
+        (DONE, 'Done'),
+        (FAILED, 'Failed'),
+    ]
+
+    order = models.ForeignKey(Order, on_delete=models.CASCADE, related_name='enhancement_jobs')
+    finger = models.CharField(max_length=50)
+    source = models.CharField(max_length=64)
+    params = models.CharField(max_length=16)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    result = models.CharField(max_length=64, blank=True, default="")
+    error = models.TextField(blank=True, default="")
+    attempts = models.PositiveSmallIntegerField(default=0)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'id'], name='core_job_status_idx'),
+            # the blob sweeper looks up queued digests in both columns
+            models.Index(fields=['source'], name='core_job_source_idx'),
+            models.Index(fields=['result'], name='core_job_result_idx'),
+        ]
+
+    def __str__(self):
+        return f"Enhance {self.finger} of order {self.order_id} ({self.status})"
+
+
+class OrderDailyStat(models.Model):
+    """Orders per day, type, operator and location, kept current by core.stats.
+
+    Dashboards aggregate these rows instead of scanning Order, so their cost
+    grows with the number of distinct groups rather than with orders.
+    """
+    day = models.DateField()
+    order_type = models.CharField(max_length=20)
+    operator = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='order_stats', null=True, blank=True)
+    district = models.CharField(max_length=100, blank=True, default="")
+    state = models.CharField(max_length=100, blank=True, default="")
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['day', 'order_type', 'operator', 'district', 'state'], name='core_orderstat_group'),
+        ]
+        indexes = [
+            models.Index(fields=['operator', 'day'], name='core_orderstat_operator_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.day} {self.order_type} by {self.operator_id}: {self.count}"
+
+
+class BlobSweep(models.Model):
+    """A fingerprint blob that may have lost its last reference, checked by `manage.py sweep_blobs`"""
+    digest = models.CharField(max_length=64, unique=True)
+    # refreshed when the digest is queued again, so the grace period restarts
+    queued_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['queued_at'], name='core_blobsweep_queued_idx'),
+        ]
+
+    def __str__(self):
+        return f"Sweep {self.digest}"
+
+
+class OrderBlob(models.Model):
+    """One blob an order's fingerprints reference, kept in step with Order.fingerprints by core.sweeper.
+
+    Finger names are arbitrary JSON keys, so this is what lets the sweeper
+    check a digest with an index lookup instead of reading every order.
+    """
+    order = models.ForeignKey(Order, on_delete=models.CASCADE, related_name='blob_refs')
+    digest = models.CharField(max_length=64)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['digest'], name='core_orderblob_digest_idx'),
+        ]
+
     def __str__(self):
-        return f"Order {self.orderType} for {self.fullName}"
\ No newline at end of file
+        return f"Order {self.order_id} uses {self.digest}"
@@ -0,0 +1,98 @@
+import csv
+import io
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.contrib.auth.validators import UnicodeUsernameValidator
+from django.core.exceptions import ValidationError
+from django.db import transaction
+
+from .utils import _available_cpus
+
+IMPORT_COLUMNS = ("username", "password")
+INSERT_BATCH_SIZE = 200
+
+
+class InvalidOperatorCSV(ValueError):
+    pass
+
+
+def read_operator_csv(text):
+    """(row number, username, password) for each data row of an operator CSV"""
+    reader = csv.DictReader(io.StringIO(text))
+    columns = {(name or "").strip().lower(): name for name in reader.fieldnames or []}
+    missing = [column for column in IMPORT_COLUMNS if column not in columns]
+    if missing:
+        raise InvalidOperatorCSV(f"Missing column(s): {', '.join(missing)}")
+    return [
+        (number, (row[columns["username"]] or "").strip(), row[columns["password"]] or "")
+        for number, row in enumerate(reader, start=2)
+    ]
+
+
+def hash_passwords(passwords):
+    """make_password for many passwords, spread over a process pool.
+
+    Hashing is CPU-bound and holds the GIL, so threads wouldn't help. The
+    pool lives only as long as the import so idle web workers don't keep
+    interpreters around. It is spawned rather than forked: the server
+    process runs other threads (the event loop, asgiref's sync thread, the
+    enhancement pool) and a forked child could inherit a lock one of them held.
+    """
+    if len(passwords) < 2:
+        return [make_password(password) for password in passwords]
+    workers = min(_available_cpus(), len(passwords))
+    chunksize = max(1, len(passwords) // (workers * 4))
+    with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn"), initializer=django.setup) as pool:
+        return list(pool.map(make_password, passwords, chunksize=chunksize))
+
+
+def import_operators(rows):
+    """Create operators from (row, username, password); one result per row.
+
+    Existing usernames are found with a single query and the new users are
+    inserted with batched INSERTs in one transaction. A username taken
+    concurrently makes the whole import fail with IntegrityError.
+    """
+    validate_username = UnicodeUsernameValidator()
+    max_length = User._meta.get_field("username").max_length
+    usernames = [username for _, username, _ in rows]
+    existing = set(User.objects.filter(username__in=usernames).values_list("username", flat=True))
+
+    results, pending, seen = [], [], {}
+    for number, username, password in rows:
+        result = {"row": number, "username": username}
+        results.append(result)
+        errors = []
+        if not username:
+            errors.append("Username is required.")
+        elif len(username) > max_length:
+            errors.append(f"Username must be at most {max_length} characters.")
+        else:
+            try:
+                validate_username(username)
+            except ValidationError as e:
+                errors.extend(e.messages)
+        if not password:
+            errors.append("Password is required.")
+
+        if errors:
+            result.update(status="invalid", errors=errors)
+        elif username in existing:
+            result.update(status="exists")
+        elif username in seen:
+            result.update(status="duplicate", duplicate_of=seen[username])
+        else:
+            seen[username] = number
+            pending.append((result, username, password))
+
+    hashes = hash_passwords([password for _, _, password in pending])
+    users = [User(username=username, password=hashed, is_staff=False) for (_, username, _), hashed in zip(pending, hashes)]
+    with transaction.atomic():
+        User.objects.bulk_create(users, batch_size=INSERT_BATCH_SIZE)
+    for (result, _, _), user in zip(pending, users):
+        result.update(status="created", id=user.pk)
+    return results
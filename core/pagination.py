@@ -0,0 +1,144 @@
+import base64
+import json
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """Cursor pagination on (<ordering field>, id), newest first by default.
+
+    Every page is a single indexed range query of page_size + 1 rows, so the
+    cost doesn't grow with the number of orders or how deep the client pages.
+    Only non-null fields listed in `ordering_fields` may be used for ordering.
+    """
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    ordering_param = 'ordering'
+    page_size = 50
+    max_page_size = 200
+    ordering = '-created_at'
+    ordering_fields = ['created_at']
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        window = self.window(queryset, request)
+        return self.set_page(list(window[:self.page_size + 1]))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        window = self.window(queryset, request)
+        return self.set_page([obj async for obj in window[:self.page_size + 1]])
+
+    def window(self, queryset, request):
+        """The ordered, cursor-filtered queryset; works with DRF and plain Django requests"""
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_ordering(request)
+        field = self.ordering.lstrip('-')
+        descending = self.ordering.startswith('-')
+
+        self.cursor = self.decode_cursor(request, queryset.model)
+        self.reverse = bool(self.cursor and self.cursor['r'])
+
+        if self.cursor:
+            cursor = self.cursor
+            after = Q(**{field: cursor['v'], 'id__gt': cursor['id']}) | Q(**{f'{field}__gt': cursor['v']})
+            before = Q(**{field: cursor['v'], 'id__lt': cursor['id']}) | Q(**{f'{field}__lt': cursor['v']})
+            queryset = queryset.filter(after if descending == self.reverse else before)
+
+        if descending == self.reverse:
+            return queryset.order_by(field, 'id')
+        return queryset.order_by(f'-{field}', '-id')
+
+    def set_page(self, results):
+        has_more = len(results) > self.page_size
+        results = results[:self.page_size]
+        if self.reverse:
+            results.reverse()
+
+        self.page = results
+        if self.reverse:
+            self.has_next = True
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = self.cursor is not None
+        return results
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.GET[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if size <= 0:
+            return self.page_size
+        return min(size, self.max_page_size)
+
+    def get_ordering(self, request):
+        ordering = request.GET.get(self.ordering_param)
+        if not ordering:
+            return self.ordering
+        if ordering.lstrip('-') not in self.ordering_fields:
+            raise ValidationError({self.ordering_param: f"Must be one of {', '.join(self.ordering_fields)}, optionally prefixed with '-'."})
+        return ordering
+
+    def decode_cursor(self, request, model):
+        encoded = request.GET.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        field = model._meta.get_field(self.ordering.lstrip('-'))
+        try:
+            cursor = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')))
+            if cursor['o'] != self.ordering:
+                raise ValueError('cursor belongs to another ordering')
+            # a malformed value would otherwise only fail inside the query
+            value = field.to_python(cursor['v'])
+            if value is None:
+                raise ValueError('cursor has no value')
+            return {'v': value, 'id': int(cursor['id']), 'r': bool(cursor.get('r'))}
+        except (TypeError, ValueError, KeyError, UnicodeError, DjangoValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, obj, reverse):
+        value = getattr(obj, self.ordering.lstrip('-'))
+        value = value.isoformat() if hasattr(value, 'isoformat') else str(value)
+        cursor = {'o': self.ordering, 'v': value, 'id': obj.pk, 'r': int(reverse)}
+        encoded = base64.urlsafe_b64encode(json.dumps(cursor, separators=(',', ':')).encode('ascii'))
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded.decode('ascii'))
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_paginated_data(self, data):
+        return {
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        }
+
+    def get_paginated_response(self, data):
+        return Response(self.get_paginated_data(data))
+
+
+class OrderPagination(KeysetPagination):
+    ordering_fields = ['created_at', 'district', 'state', 'pincode']
+
+
+class OperatorPagination(PageNumberPagination):
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
@@ -1,7 +1,15 @@
 from django.contrib.auth.models import User
+from django.contrib.auth.validators import UnicodeUsernameValidator
+from django.db import IntegrityError, transaction
 from rest_framework import serializers
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework.settings import api_settings as rest_settings
+from rest_framework_simplejwt.settings import api_settings
 import json
+from .authentication import is_revoked
 from .models import Order
+from .utils import InvalidFingerprint, save_fingerprints
 
 class RegisterSerializer(serializers.ModelSerializer):
     confirm_password = serializers.CharField(write_only=True)
@@ -10,43 +18,84 @@ class RegisterSerializer(serializers.ModelSerializer):
         model = User
         fields = ("username", "password", "confirm_password")
         extra_kwargs = {
-            "password": {"write_only": True}
+            "password": {"write_only": True},
+            # uniqueness is left to the INSERT, see create()
+            "username": {"validators": [UnicodeUsernameValidator()]},
         }
 
     def validate(self, data):
         if data["password"] != data["confirm_password"]:
             raise serializers.ValidationError("Passwords do not match")
-        if User.objects.filter(username=data["username"]).exists():
-            raise serializers.ValidationError("Username already exists")
         return data
 
     def create(self, validated_data):
         validated_data.pop("confirm_password")
-        user = User.objects.create_user(**validated_data)
-        return user
+        try:
+            with transaction.atomic():
+                return User.objects.create_user(**validated_data)
+        except IntegrityError:
+            raise serializers.ValidationError({rest_settings.NON_FIELD_ERRORS_KEY: ["Username already exists"]})
 
 
 class LoginSerializer(serializers.Serializer):
     username = serializers.CharField()
     password = serializers.CharField()
 
+def _add_user_claims(token, user):
+    token["username"] = user.username
+    token["is_staff"] = user.is_staff
+    return token
+
+
+class TokenLoginSerializer(TokenObtainPairSerializer):
+    """JWT pair whose claims carry what views read from request.user"""
+
+    @classmethod
+    def get_token(cls, user):
+        return _add_user_claims(super().get_token(user), user)
+
+
+class TokenRevocableRefreshSerializer(TokenRefreshSerializer):
+    """Refresh that honours revocation and re-reads the user's claims"""
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs["refresh"])
+        if is_revoked(refresh):
+            raise AuthenticationFailed("Token has been revoked", "token_revoked")
+        user = User.objects.filter(pk=refresh.get(api_settings.USER_ID_CLAIM)).first()
+        if user is None or not api_settings.USER_AUTHENTICATION_RULE(user):
+            raise AuthenticationFailed(self.error_messages["no_active_account"], "no_active_account")
+        return {"access": str(_add_user_claims(refresh.access_token, user))}
+
+
+class TokenRevokeSerializer(serializers.Serializer):
+    refresh = serializers.CharField()
+
 class OperatorCreateSerializer(serializers.ModelSerializer):
     password = serializers.CharField(write_only=True)
 
     class Meta:
         model = User 
         fields = ['username','password']
+        extra_kwargs = {'username': {'validators': [UnicodeUsernameValidator()]}}
 
     def create(self, validated_data):
         user = User(username=validated_data['username'], is_staff=False)
         user.set_password(validated_data['password'])
-        user.save()
+        # one INSERT; the unique index on username reports duplicates, even racing ones
+        try:
+            with transaction.atomic():
+                user.save(force_insert=True)
+        except IntegrityError:
+            raise serializers.ValidationError({'username': [User._meta.get_field('username').error_messages['unique']]})
         return user
 
 class OperatorListSerializer(serializers.ModelSerializer):
+    order_count = serializers.IntegerField(read_only=True)
+
     class Meta:
         model = User
-        fields = ['id','username', 'date_joined']
+        fields = ['id','username', 'date_joined', 'order_count']
         
 class OrderSerializer(serializers.ModelSerializer):
     operator_username = serializers.CharField(source='created_by.username', read_only=True)
@@ -54,7 +103,7 @@ class OrderSerializer(serializers.ModelSerializer):
     class Meta:
         model = Order
         fields = '__all__'
-        read_only_fields = ['created_at', 'created_by']
+        read_only_fields = ['created_at', 'created_by', 'idempotencyKey']
     
 
     #common fields
@@ -105,6 +154,18 @@ class OrderSerializer(serializers.ModelSerializer):
             if not fingerprints or not any(fingerprints.values()):
                 raise serializers.ValidationError("Fingerprints must be a valid file.")
         return data
+
+    def create(self, validated_data):
+        # keep only blob references on the order row; multipart uploads are already stored
+        stored = self.context.get('stored_fingerprints')
+        if stored is not None:
+            validated_data['fingerprints'] = stored
+        else:
+            try:
+                validated_data['fingerprints'] = save_fingerprints(validated_data.get('fingerprints'))
+            except InvalidFingerprint as e:
+                raise serializers.ValidationError({'fingerprints': {e.finger: str(e)}})
+        return super().create(validated_data)
     
 
 
@@ -113,5 +174,5 @@ class OrderListSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Order
-        exclude = ["fingerprints"]
+        exclude = ["fingerprints", "formData"]
 
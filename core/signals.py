@@ -0,0 +1,54 @@
+from django.contrib.auth.models import User
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from .backends import invalidate_cached_user
+from .deletion import bulk_deleting
+from .metrics import record_query
+from .models import Order
+from .stats import STAT_FIELDS, record_orders
+from .sweeper import index_order_blobs, order_blobs, queue_blob_sweep
+
+
+@receiver(pre_delete, sender=Order)
+def order_deleted(sender, instance, **kwargs):
+    """Per-instance deletes (admin, shell); core.deletion.delete_orders does this in bulk"""
+    if bulk_deleting():
+        return
+    missing = {'fingerprints', *STAT_FIELDS} & instance.get_deferred_fields()
+    if missing:
+        # ownership checks load the row without these; one query fetches them all
+        instance.refresh_from_db(fields=list(missing))
+    results = instance.enhancement_jobs.exclude(result="").values_list('result', flat=True)
+    queue_blob_sweep([*order_blobs(instance.fingerprints), *results])
+    record_orders([instance], -1)
+
+
+@receiver(post_save, sender=Order)
+def order_created(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        record_orders([instance])
+
+
+@receiver(post_save, sender=Order)
+def order_blobs_saved(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    """Keep OrderBlob in step; bulk_create callers use index_order_blobs themselves"""
+    if raw or 'fingerprints' in instance.get_deferred_fields():
+        return
+    if created or update_fields is None or 'fingerprints' in update_fields:
+        index_order_blobs([instance], replace=not created)
+
+
+@receiver(connection_created)
+def count_queries(sender, connection, **kwargs):
+    # the wrapper object outlives reconnects, so only add the hook once
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def drop_cached_user(sender, instance, **kwargs):
+    # password, is_staff or is_active changes must reach the next request
+    invalidate_cached_user(instance.pk)
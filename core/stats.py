@@ -0,0 +1,63 @@
+from collections import Counter
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .models import Order, OrderDailyStat
+
+# Order attnames a statistics row is keyed on (as get_deferred_fields reports them)
+STAT_FIELDS = ('created_at', 'orderType', 'created_by_id', 'district', 'state')
+
+
+def _group(order):
+    return (
+        timezone.localdate(order.created_at),
+        order.orderType,
+        order.created_by_id,
+        order.district or "",
+        order.state or "",
+    )
+
+
+def _bump(group, delta):
+    day, order_type, operator_id, district, state = group
+    key = dict(day=day, order_type=order_type, operator_id=operator_id, district=district, state=state)
+    if OrderDailyStat.objects.filter(**key).update(count=F('count') + delta) or delta < 0:
+        return
+    try:
+        with transaction.atomic():
+            OrderDailyStat.objects.create(**key, count=delta)
+    except IntegrityError:
+        # another request created the row first
+        OrderDailyStat.objects.filter(**key).update(count=F('count') + delta)
+
+
+def record_orders(orders, delta=1):
+    """Add (or with delta=-1, remove) orders to the statistics, one UPDATE per group"""
+    for group, count in Counter(_group(order) for order in orders).items():
+        _bump(group, count * delta)
+
+
+def rebuild_order_stats():
+    """Recompute every statistics row from Order, e.g. after writes that skipped signals"""
+    groups = (
+        Order.objects
+        .annotate(day=TruncDate('created_at'))
+        .values('day', 'orderType', 'created_by', 'district', 'state')
+        .annotate(n=Count('id'))
+        .order_by()
+    )
+    with transaction.atomic():
+        OrderDailyStat.objects.all().delete()
+        OrderDailyStat.objects.bulk_create(
+            (
+                OrderDailyStat(
+                    day=row['day'], order_type=row['orderType'], operator_id=row['created_by'],
+                    district=row['district'] or "", state=row['state'] or "", count=row['n'],
+                )
+                for row in groups.iterator(chunk_size=2000)
+            ),
+            batch_size=1000,
+        )
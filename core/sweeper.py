@@ -0,0 +1,130 @@
+from datetime import timedelta
+from itertools import islice
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .blobs import blob_store
+from .cache import enhanced_cache, enhanced_cache_key
+from .models import BlobSweep, EnhancementJob, OrderBlob
+
+
+def order_blobs(fingerprints):
+    """Blob digests referenced by an order's fingerprints"""
+    return {
+        ref["blob"]
+        for ref in (fingerprints or {}).values()
+        if isinstance(ref, dict) and ref.get("blob")
+    }
+
+
+def queue_blob_sweep(digests):
+    """Have the sweeper check these blobs, e.g. after deleting the orders that used them"""
+    digests = {digest for digest in digests if digest}
+    if digests:
+        BlobSweep.objects.bulk_create(
+            [BlobSweep(digest=digest) for digest in digests],
+            update_conflicts=True, unique_fields=['digest'], update_fields=['queued_at'],
+        )
+
+
+def index_order_blobs(orders, replace=False):
+    """Record the blobs these orders' fingerprints reference (OrderBlob rows) for the sweeper.
+
+    Call it wherever orders are written without post_save, e.g. after
+    bulk_create; `replace` drops the orders' previous rows first.
+    """
+    orders = list(orders)
+    if replace:
+        OrderBlob.objects.filter(order__in=orders).delete()
+    OrderBlob.objects.bulk_create(
+        [OrderBlob(order=order, digest=digest) for order in orders for digest in order_blobs(order.fingerprints)],
+        batch_size=1000,
+    )
+
+
+def referenced_blobs(digests):
+    """The subset of `digests` still used by an order or an enhancement job.
+
+    Blobs are shared between orders, so one can only go once nothing uses it.
+    Each lookup is an index probe per digest, so a batch costs the same
+    however many orders there are.
+    """
+    digests = list(digests)
+    return {
+        *OrderBlob.objects.filter(digest__in=digests).values_list('digest', flat=True),
+        *EnhancementJob.objects.filter(source__in=digests).values_list('source', flat=True),
+        *EnhancementJob.objects.filter(result__in=digests).values_list('result', flat=True),
+    }
+
+
+def _remove_blobs(digests):
+    for digest in digests:
+        blob_store.delete(digest)
+    # the shared tier and this process's local one; other processes' local
+    # tiers are small and age the entries out
+    enhanced_cache.delete_many([enhanced_cache_key(digest) for digest in digests])
+
+
+def _grace_cutoff(grace):
+    if grace is None:
+        grace = settings.BLOB_SWEEP_GRACE_SECONDS
+    return timezone.now() - timedelta(seconds=grace)
+
+
+def sweep_queued_blobs(grace=None, batch_size=500, dry_run=False):
+    """Delete queued blobs nothing references any more; returns (checked, deleted).
+
+    Only entries queued more than `grace` seconds ago are considered. Each
+    batch holds its queue rows locked while files are deleted, and uploads
+    reprieve a digest (FingerprintBlobStore.reprieve) before trusting an
+    existing copy, so an upload either takes the entry out of the batch or
+    waits and rewrites the file.
+    """
+    cutoff = _grace_cutoff(grace)
+    due = BlobSweep.objects.filter(queued_at__lte=cutoff).order_by('pk')
+    checked = deleted = last_pk = 0
+    while True:
+        with transaction.atomic():
+            batch = list(due.filter(pk__gt=last_pk).select_for_update().values_list('pk', 'digest')[:batch_size])
+            if not batch:
+                break
+            last_pk = batch[-1][0]
+            referenced = referenced_blobs(digest for _, digest in batch)
+            orphans = [digest for _, digest in batch if digest not in referenced]
+            if not dry_run:
+                _remove_blobs(orphans)
+                BlobSweep.objects.filter(pk__in=[pk for pk, _ in batch]).delete()
+        checked += len(batch)
+        deleted += len(orphans)
+    return checked, deleted
+
+
+def queue_unreferenced_blobs(grace=None, batch_size=500):
+    """Mark-and-sweep the whole blob store, for files leaked before deletions were queued.
+
+    Lists every stored blob, so it is much slower than `sweep_queued_blobs`.
+    Unreferenced blobs older than the grace period are queued rather than
+    deleted, so they go through the same locking; returns (checked, queued).
+    """
+    cutoff = _grace_cutoff(grace)
+    checked = queued = 0
+    digests = iter(blob_store.digests())
+    while batch := list(islice(digests, batch_size)):
+        checked += len(batch)
+        referenced = referenced_blobs(batch)
+        orphans = []
+        for digest in batch:
+            if digest in referenced:
+                continue
+            try:
+                if blob_store.modified_time(digest) > cutoff:
+                    continue
+            except (NotImplementedError, FileNotFoundError):
+                # no timestamp to prove the blob is old, so leave it
+                continue
+            orphans.append(digest)
+        queue_blob_sweep(orphans)
+        queued += len(orphans)
+    return checked, queued
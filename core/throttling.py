@@ -0,0 +1,68 @@
+import threading
+
+from django.core.cache import caches
+from rest_framework.throttling import SimpleRateThrottle
+
+_bucket_lock = threading.Lock()
+
+
+class TokenBucketThrottle(SimpleRateThrottle):
+    """SimpleRateThrottle with a token bucket in place of the request history.
+
+    A bucket holds up to `num_requests` tokens and refills at `num_requests`
+    per period, so short bursts pass while the sustained rate stays capped,
+    and its state is two floats rather than a list of timestamps. Buckets live
+    in the process-local 'throttle' cache, so the effective limit scales with
+    the number of workers.
+    """
+    cache_alias = "throttle"
+
+    @property
+    def cache(self):
+        return caches[self.cache_alias]
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        self.refill = self.num_requests / self.duration
+        with _bucket_lock:
+            now = self.timer()
+            tokens, updated = self.cache.get(self.key, (self.num_requests, now))
+            tokens = min(self.num_requests, tokens + (now - updated) * self.refill)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            # an untouched bucket is full again after one period, so it can expire then
+            self.cache.set(self.key, (tokens, now), self.duration)
+        self.tokens = tokens
+        return allowed
+
+    def wait(self):
+        return (1 - self.tokens) / self.refill
+
+
+class LoginIPThrottle(TokenBucketThrottle):
+    """Password attempts per client address"""
+    scope = "login_ip"
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {"scope": self.scope, "ident": self.get_ident(request)}
+
+
+class LoginUsernameThrottle(TokenBucketThrottle):
+    """Password attempts per account, however many addresses they come from"""
+    scope = "login_username"
+
+    def get_cache_key(self, request, view):
+        username = request.data.get("username") if hasattr(request.data, "get") else None
+        if not isinstance(username, str) or not username.strip():
+            return None
+        return self.cache_format % {"scope": self.scope, "ident": username.strip().lower()}
+
+
+class RegisterIPThrottle(LoginIPThrottle):
+    scope = "register_ip"
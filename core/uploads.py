@@ -0,0 +1,68 @@
+import hashlib
+
+from django.conf import settings
+from django.core.files.uploadedfile import TemporaryUploadedFile
+from django.core.files.uploadhandler import FileUploadHandler, SkipFile
+
+from .utils import read_image_header
+
+FIELD_PREFIX = "fingerprints."
+HEADER_BYTES = 32
+ACCEPTED_TYPES = {"image/png", "image/bmp", "image/jpeg", "image/webp", "image/tiff"}
+
+
+class FingerprintUploadHandler(FileUploadHandler):
+    """Streams `fingerprints.<finger>` file parts to temporary files.
+
+    Each part is hashed and size-checked as it arrives, and its image header
+    is validated from the first bytes, so no upload is ever held in memory.
+    Rejected parts are skipped and listed in `rejected`.
+    """
+
+    def __init__(self, request=None):
+        super().__init__(request)
+        self.rejected = {}
+
+    def new_file(self, field_name, *args, **kwargs):
+        if not field_name.startswith(FIELD_PREFIX):
+            raise SkipFile()
+        super().new_file(field_name, *args, **kwargs)
+        self.finger = field_name[len(FIELD_PREFIX):]
+        self.file = TemporaryUploadedFile(self.file_name, self.content_type, 0, self.charset, self.content_type_extra)
+        self.hasher = hashlib.sha256()
+        self.size = 0
+
+    def reject(self, reason):
+        self.rejected[self.finger] = reason
+        self.file.close()
+        raise SkipFile()
+
+    def receive_data_chunk(self, raw_data, start):
+        if start == 0:
+            # chunks are chunk_size (64 KB) long, so the header is all in the first
+            self.check_header(raw_data[:HEADER_BYTES])
+        self.size += len(raw_data)
+        if self.size > settings.FINGERPRINT_MAX_UPLOAD_SIZE:
+            self.reject(f"Larger than {settings.FINGERPRINT_MAX_UPLOAD_SIZE} bytes")
+        self.hasher.update(raw_data)
+        self.file.write(raw_data)
+
+    def check_header(self, head):
+        content_type, width, height = read_image_header(head)
+        if content_type not in ACCEPTED_TYPES:
+            self.reject("Not a supported image")
+        limit = settings.FINGERPRINT_MAX_DIMENSION
+        if width is not None and not (0 < width <= limit and 0 < height <= limit):
+            self.reject(f"Image must be at most {limit}x{limit} pixels")
+        self.image_info = {"content_type": content_type, "width": width, "height": height}
+
+    def file_complete(self, file_size):
+        if not self.size:
+            self.rejected[self.finger] = "Empty file"
+            self.file.close()
+            return None
+        self.file.seek(0)
+        self.file.size = file_size
+        self.file.sha256 = self.hasher.hexdigest()
+        self.file.image_info = self.image_info
+        return self.file
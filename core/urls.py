@@ -1,5 +1,6 @@
 from django.urls import path
-from .views import RegisterView, LoginView, LogoutView, UserView, CSRFView, OperatorCreateView, OperatorListView, OperatorDeleteView,OrderView, FingerprintsView
+from .views import RegisterView, LoginView, LogoutView, UserView, CSRFView, OperatorCreateView, OperatorListView, OperatorDeleteView, OperatorImportView,OrderView, FingerprintsView, FingerprintImageView, OrderExportView, OrderBulkView, MetricsView, TokenLoginView, TokenRefreshAccessView, TokenRevokeView, OrderStatsView
+from .async_views import AsyncOrderView, AsyncFingerprintsView
 
 from django.conf import settings
 from django.conf.urls.static import static
@@ -13,14 +14,30 @@ urlpatterns = [
     path("csrf/", CSRFView.as_view()),
     path("user/", UserView.as_view()),
 
+    path("token/", TokenLoginView.as_view()),
+    path("token/refresh/", TokenRefreshAccessView.as_view()),
+    path("token/revoke/", TokenRevokeView.as_view()),
+
     path("operators/", OperatorListView.as_view()),
     path("create-operator/", OperatorCreateView.as_view()),
     path("delete-operator/<int:pk>/", OperatorDeleteView.as_view()),
+    path("import-operators/", OperatorImportView.as_view()),
 
     path("orders/", OrderView.as_view()),
     path("orders/<int:pk>/", OrderView.as_view()),
+    path("orders/bulk/", OrderBulkView.as_view()),
+    path("orders/stats/", OrderStatsView.as_view()),
+    path("orders/export.<str:fmt>", OrderExportView.as_view()),
 
     path("orders/<int:pk>/fingerprints/",FingerprintsView.as_view()),
+    path("orders/<int:pk>/fingerprints/<str:finger>.png", FingerprintImageView.as_view(), name="order-fingerprint-image"),
+
+    path("metrics/", MetricsView.as_view()),
+
+    # same endpoints as async views, for the ASGI deployment (see gunicorn.conf.py)
+    path("async/orders/", AsyncOrderView.as_view()),
+    path("async/orders/<int:pk>/", AsyncOrderView.as_view()),
+    path("async/orders/<int:pk>/fingerprints/", AsyncFingerprintsView.as_view()),
 
 ]
 urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
\ No newline at end of file
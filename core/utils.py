@@ -1,53 +1,324 @@
-from django.conf import settings
 import os
-import uuid
+import struct
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+
 import numpy as np
 import cv2, base64
+from django.conf import settings
+
+from .blobs import blob_store
+from .metrics import timed
 
 
+IMAGE_SIGNATURES = [
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"BM", "image/bmp"),
+    (b"GIF8", "image/gif"),
+    (b"II*\x00", "image/tiff"),
+    (b"MM\x00*", "image/tiff"),
+]
 
-def save_fingerprints(fingerprints, order_id):
-    """Decode base64 strings and save as PNG files"""
-    saved_files = {}
-    folder = os.path.join(settings.MEDIA_ROOT, "fingerprints", str(order_id))
-    os.makedirs(folder, exist_ok=True)
 
-    for finger, data in fingerprints.items():
-        if data.startswith("data:image"):
-            format, imgstr = data.split(";base64,")
-            ext = format.split("/")[-1]
-            filename = f"{finger}_{uuid.uuid4().hex}.{ext}"
-            filepath = os.path.join(folder, filename)
-            with open(filepath, "wb") as f:
-                f.write(base64.b64decode(imgstr))
-            saved_files[finger] = f"fingerprints/{order_id}/{filename}"
+def sniff_image_type(data):
+    """Guess the image content type from its magic bytes"""
+    head = bytes(data[:12])
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    for signature, content_type in IMAGE_SIGNATURES:
+        if head.startswith(signature):
+            return content_type
+    return "application/octet-stream"
+
+
+def _jpeg_size(data):
+    # walk the marker segments up to the first start-of-frame
+    i = 2
+    while i + 9 <= len(data):
+        if data[i] != 0xFF:
+            return None
+        marker = data[i + 1]
+        if marker == 0xFF:
+            i += 1
+        elif marker == 0x01 or 0xD0 <= marker <= 0xD8:
+            i += 2
+        elif 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+            height, width = struct.unpack(">HH", data[i + 5:i + 9])
+            return width, height
         else:
-            saved_files[finger] = data
-    return saved_files
+            i += 2 + struct.unpack(">H", data[i + 2:i + 4])[0]
+    return None
 
-def enhance_fingerprint(base64_str):
+
+def _webp_size(data):
+    chunk = data[12:16]
+    if chunk == b"VP8 " and len(data) >= 30:
+        width, height = struct.unpack("<HH", data[26:30])
+        return width & 0x3FFF, height & 0x3FFF
+    if chunk == b"VP8L" and len(data) >= 25:
+        bits = int.from_bytes(data[21:25], "little")
+        return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+    if chunk == b"VP8X" and len(data) >= 30:
+        return int.from_bytes(data[24:27], "little") + 1, int.from_bytes(data[27:30], "little") + 1
+    return None
+
+
+def _tiff_size(data):
+    # ImageWidth (256) and ImageLength (257) from the first directory
+    order = "<" if data[:2] == b"II" else ">"
+    if len(data) < 8:
+        return None
+    offset = struct.unpack(order + "I", data[4:8])[0]
+    if offset + 2 > len(data):
+        return None
+    size = {}
+    for n in range(struct.unpack(order + "H", data[offset:offset + 2])[0]):
+        entry = offset + 2 + n * 12
+        if entry + 12 > len(data):
+            break
+        tag, value_type = struct.unpack(order + "HH", data[entry:entry + 4])
+        if tag in (256, 257):
+            value_format = order + ("H" if value_type == 3 else "I")
+            size[tag] = struct.unpack_from(value_format, data, entry + 8)[0]
+    return (size[256], size[257]) if len(size) == 2 else None
+
+
+def read_image_header(head):
+    """(content_type, width, height) from the first bytes of an image.
+
+    Only headers are parsed, nothing is decoded; width and height are None
+    when `head` ends before the dimensions (JPEG and TIFF may keep them well
+    past the first bytes).
+    """
+    head = bytes(head)
+    content_type = sniff_image_type(head)
+    size = None
+    if content_type == "image/png" and len(head) >= 24 and head[12:16] == b"IHDR":
+        size = struct.unpack(">II", head[16:24])
+    elif content_type == "image/bmp" and len(head) >= 26:
+        width, height = struct.unpack("<ii", head[18:26])
+        size = abs(width), abs(height)
+    elif content_type == "image/gif" and len(head) >= 10:
+        size = struct.unpack("<HH", head[6:10])
+    elif content_type == "image/webp":
+        size = _webp_size(head)
+    elif content_type == "image/jpeg":
+        size = _jpeg_size(head)
+    elif content_type == "image/tiff":
+        size = _tiff_size(head)
+    width, height = size or (None, None)
+    return content_type, width, height
+
+
+class InvalidFingerprint(ValueError):
+    def __init__(self, finger, message):
+        super().__init__(message)
+        self.finger = finger
+
+
+# lossless encodings for stored fingerprints: (extension, content type, encoder flags)
+STORAGE_FORMATS = {
+    "png": (".png", "image/png", [cv2.IMWRITE_PNG_COMPRESSION, 9]),
+    "webp": (".webp", "image/webp", [cv2.IMWRITE_WEBP_QUALITY, 101]),  # quality > 100 is lossless
+}
+
+
+def normalize_fingerprint(raw):
+    """Check dimensions, decode once and re-encode as lossless 8-bit grayscale.
+
+    Returns (stored bytes, reference fields). An upload that is already 8-bit
+    grayscale and smaller than the re-encoded image is kept as it was.
+    """
+    # check the declared size before decoding: a small file can claim a huge bitmap
+    _, width, height = read_image_header(raw)
+    if width is None:
+        raise ValueError("Could not read fingerprint image dimensions")
+    limit = settings.FINGERPRINT_MAX_DIMENSION
+    if not (0 < width <= limit and 0 < height <= limit):
+        raise ValueError(f"Image must be at most {limit}x{limit} pixels")
+
+    img = cv2.imdecode(np.frombuffer(raw, np.uint8), cv2.IMREAD_UNCHANGED)
+    if img is None:
+        raise ValueError("Could not decode fingerprint image")
+    height, width = img.shape[:2]
+
+    already_gray = img.ndim == 2 and img.dtype == np.uint8
+    if img.ndim == 3:
+        img = cv2.cvtColor(img, cv2.COLOR_BGRA2GRAY if img.shape[2] == 4 else cv2.COLOR_BGR2GRAY)
+    if img.dtype != np.uint8:
+        img = cv2.convertScaleAbs(img, alpha=255.0 / max(int(img.max()), 1))
+
+    extension, content_type, flags = STORAGE_FORMATS[settings.FINGERPRINT_STORAGE_FORMAT]
+    _, encoded = cv2.imencode(extension, img, flags)
+    stored = encoded.tobytes()
+    if already_gray and len(raw) <= len(stored):
+        stored, content_type = bytes(raw), sniff_image_type(raw)
+
+    return stored, {
+        "content_type": content_type,
+        "size": len(stored),
+        "width": width,
+        "height": height,
+        "original_content_type": sniff_image_type(raw),
+        "original_size": len(raw),
+    }
+
+
+def store_fingerprint_image(raw):
+    """Normalize an image, put it in the blob store and return its reference"""
+    if not settings.FINGERPRINT_NORMALIZE:
+        return {"blob": blob_store.put(raw), "content_type": sniff_image_type(raw), "size": len(raw)}
+    stored, info = normalize_fingerprint(raw)
+    return {"blob": blob_store.put(stored), **info}
+
+
+def _store_image(finger, raw):
     try:
-        # 1. Decode base64 → NumPy grayscale
-        image_data = base64.b64decode(base64_str)
-        nparr = np.frombuffer(image_data, np.uint8)
-        img = cv2.imdecode(nparr, cv2.IMREAD_GRAYSCALE)
+        return store_fingerprint_image(raw)
+    except ValueError as e:
+        raise InvalidFingerprint(finger, str(e))
 
 
-        # 3. Contrast enhancement (CLAHE)
-        clahe = cv2.createCLAHE(clipLimit=3.0, tileGridSize=(8,8))
-        img = clahe.apply(img)
+def save_fingerprints(fingerprints):
+    """Move fingerprint images into the blob store and return references.
 
-        gaussian = cv2.GaussianBlur(img, (0,0), 3)
-        img_sharp = cv2.addWeighted(img,1.5,gaussian, -0.5,0)
+    Accepts the device payload ({"BitmapData": <base64>, ...}) or data URIs
+    per finger; the bitmap is normalized and replaced by its blob digest and
+    sizes. Raises InvalidFingerprint for an image that can't be stored.
+    """
+    saved = {}
+    for finger, data in (fingerprints or {}).items():
+        if isinstance(data, dict) and data.get("BitmapData"):
+            meta = {k: v for k, v in data.items() if k not in ("BitmapData", "blob")}
+            saved[finger] = {**meta, **_store_image(finger, base64.b64decode(data["BitmapData"]))}
+        elif isinstance(data, dict):
+            # never trust a client-supplied blob reference
+            saved[finger] = {k: v for k, v in data.items() if k != "blob"}
+        elif isinstance(data, str) and data.startswith("data:image"):
+            _, imgstr = data.split(";base64,", 1)
+            saved[finger] = _store_image(finger, base64.b64decode(imgstr))
+        else:
+            saved[finger] = data
+    return saved
 
-        # 4. Binarization (Otsu threshold)
-        _, img_bin = cv2.threshold(img_sharp, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
 
-        # Ensure ridges are white (255), background black (0)
-        img_bin = 255 - img_bin
+def read_fingerprint(ref):
+    """Return the stored image bytes for a fingerprint reference"""
+    return blob_store.read(ref["blob"])
 
-        _, buffer = cv2.imencode(".png", img_bin)
-        return base64.b64encode(buffer).decode("utf-8")
 
+def load_fingerprints(fingerprints):
+    """Inflate blob references back into base64 BitmapData for JSON clients"""
+    loaded = {}
+    for finger, ref in (fingerprints or {}).items():
+        if isinstance(ref, dict) and ref.get("blob"):
+            meta = {k: v for k, v in ref.items() if k != "blob"}
+            bitmap = base64.b64encode(read_fingerprint(ref)).decode("ascii")
+            loaded[finger] = {**meta, "BitmapData": bitmap}
+        else:
+            loaded[finger] = ref
+    return loaded
+
+class FingerprintEnhancer:
+    """CLAHE → unsharp mask → inverted Otsu binarization, returning PNG bytes.
+
+    Each thread keeps its own CLAHE object and scratch arrays, reused while
+    consecutive images have the same shape, so a steady stream of same-sized
+    scans allocates little beyond the decode and the encoded PNG.
+    """
+
+    def __init__(self, clip_limit=3.0, tile_grid=(8, 8), blur_sigma=3, sharpen_amount=1.5):
+        self.params = {
+            "clip_limit": clip_limit,
+            "tile_grid": tuple(tile_grid),
+            "blur_sigma": blur_sigma,
+            "sharpen_amount": sharpen_amount,
+        }
+        self._local = threading.local()
+
+    def _clahe(self):
+        clahe = getattr(self._local, "clahe", None)
+        if clahe is None:
+            clahe = cv2.createCLAHE(clipLimit=self.params["clip_limit"], tileGridSize=self.params["tile_grid"])
+            self._local.clahe = clahe
+        return clahe
+
+    def _scratch(self, shape):
+        scratch = getattr(self._local, "scratch", None)
+        if scratch is None or scratch[0].shape != shape:
+            scratch = tuple(np.empty(shape, np.uint8) for _ in range(3))
+            self._local.scratch = scratch
+        return scratch
+
+    @staticmethod
+    def _as_buffer(image):
+        # base64 text from JSON clients, raw bytes from the blob store
+        if isinstance(image, str):
+            return base64.b64decode(image)
+        return image
+
+    def enhance(self, image):
+        """Enhance base64 text, bytes, bytearray or memoryview image data"""
+        with timed("enhance"):
+            return self._enhance(image)
+
+    def _enhance(self, image):
+        img = cv2.imdecode(np.frombuffer(self._as_buffer(image), np.uint8), cv2.IMREAD_GRAYSCALE)
+        if img is None:
+            raise ValueError("Could not decode fingerprint image")
+
+        contrast, blurred, sharp = self._scratch(img.shape)
+
+        # Contrast enhancement (CLAHE)
+        self._clahe().apply(img, contrast)
+
+        # Unsharp mask
+        amount = self.params["sharpen_amount"]
+        cv2.GaussianBlur(contrast, (0, 0), self.params["blur_sigma"], dst=blurred)
+        cv2.addWeighted(contrast, amount, blurred, 1 - amount, 0, dst=sharp)
+
+        # Otsu binarization, inverted so ridges are white (255) on black
+        cv2.threshold(sharp, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU, dst=contrast)
+
+        _, buffer = cv2.imencode(".png", contrast)
+        return buffer.tobytes()
+
+
+default_enhancer = FingerprintEnhancer()
+
+
+def enhance_fingerprint(base64_str):
+    try:
+        enhanced = default_enhancer.enhance(base64_str)
+        return base64.b64encode(enhanced).decode("utf-8")
     except Exception as e:
-        return base64_str
\ No newline at end of file
+        return base64_str
+
+
+def _available_cpus():
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+# OpenCV releases the GIL, so threads give real parallelism here
+_enhance_pool = ThreadPoolExecutor(max_workers=min(10, _available_cpus()), thread_name_prefix="enhance")
+
+
+def enhance_fingerprints(fingerprints, enhance=enhance_fingerprint):
+    """Enhance {finger: image} concurrently and return results in the same order.
+
+    A finger whose enhancement raises is returned unchanged.
+    """
+    # run in a copy of the caller's context so the time lands on the right request
+    futures = {finger: _enhance_pool.submit(copy_context().run, enhance, value) for finger, value in fingerprints.items()}
+    enhanced = {}
+    for finger, future in futures.items():
+        try:
+            enhanced[finger] = future.result()
+        except Exception:
+            enhanced[finger] = fingerprints[finger]
+    return enhanced
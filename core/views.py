@@ -4,16 +4,48 @@ from rest_framework import status, permissions,generics
 from django.contrib.auth import authenticate, login, logout
 from django.views.decorators.csrf import ensure_csrf_cookie
 from django.utils.decorators import method_decorator
+from django.urls import reverse
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, StreamingHttpResponse
+from django.db import IntegrityError, transaction
+from rest_framework.parsers import JSONParser, MultiPartParser
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, quote_etag
+from django.db.models import Count, F, Max, Sum
+from django.db.models.functions import TruncMonth, TruncWeek
+from django.conf import settings
 
 from django.contrib.auth.models import User
-from .serializers import LoginSerializer,RegisterSerializer, OrderSerializer, OrderListSerializer, OperatorCreateSerializer, OperatorListSerializer
+from .serializers import LoginSerializer,RegisterSerializer, OrderSerializer, OrderListSerializer, OperatorCreateSerializer, OperatorListSerializer, TokenLoginSerializer, TokenRevocableRefreshSerializer, TokenRevokeSerializer
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
+import base64
+import hashlib
 import os
 from django.core.files.storage import default_storage
 
 
-from .models import Order
-from datetime import date
-from .utils import enhance_fingerprint
+from .models import Order, OrderDailyStat
+from .export import astream, export_stream
+from .filters import OrderFilter, OrderStatFilter
+from .operators import InvalidOperatorCSV, import_operators, read_operator_csv
+from .parsers import CSVParser, NDJSONParser
+from .uploads import FIELD_PREFIX as FINGERPRINT_FIELD_PREFIX, FingerprintUploadHandler
+from .pagination import OperatorPagination, OrderPagination
+from .authentication import StatelessJWTAuthentication, revoke_token
+from .backends import invalidate_cached_user
+from .throttling import LoginIPThrottle, LoginUsernameThrottle, RegisterIPThrottle
+from .blobs import blob_store
+from .cache import enhanced_cache_key, get_enhanced_fingerprint
+from .http import binary_response
+from .jobs import enhanced_results, queue_enhancement
+from .deletion import delete_orders
+from .stats import record_orders
+from .sweeper import index_order_blobs, order_blobs, queue_blob_sweep
+from .metrics import registry
+from .utils import InvalidFingerprint, enhance_fingerprints, load_fingerprints, save_fingerprints, store_fingerprint_image
 
 @method_decorator(ensure_csrf_cookie, name='dispatch')
 class CSRFView(APIView):
@@ -34,17 +66,75 @@ class OperatorCreateView(generics.CreateAPIView):
     serializer_class = OperatorCreateSerializer
     permission_classes = [permissions.IsAuthenticated, permissions.IsAdminUser]
 class OperatorListView(generics.ListAPIView):
-    queryset = User.objects.filter(is_staff=False)
+    """Paginated operators with their order counts; polls revalidate with ETags"""
+    queryset = User.objects.filter(is_staff=False).annotate(order_count=Count('orders')).order_by('id')
     serializer_class = OperatorListSerializer
     permission_classes = [permissions.IsAuthenticated, permissions.IsAdminUser]
+    pagination_class = OperatorPagination
+
+    def list(self, request, *args, **kwargs):
+        etag = self.get_etag(request)
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = super().list(request, *args, **kwargs)
+            response['ETag'] = etag
+        response['Cache-Control'] = 'private, no-cache'
+        return response
+
+    def get_etag(self, request):
+        # small aggregates instead of counting every operator's orders: the newest
+        # order id moves on creates, the statistics total on deletes
+        operators = User.objects.filter(is_staff=False).aggregate(count=Count('id'), latest=Max('date_joined'))
+        latest_order = Order.objects.aggregate(latest=Max('id'))['latest']
+        total_orders = OrderDailyStat.objects.aggregate(total=Sum('count'))['total']
+        state = f"{request.get_full_path()}|{operators['count']}|{operators['latest']}|{latest_order}|{total_orders}"
+        return quote_etag(hashlib.sha256(state.encode()).hexdigest()[:32])
+
+class OperatorImportView(APIView):
+    """Create operators from a CSV with username and password columns"""
+    permission_classes = [permissions.IsAuthenticated, permissions.IsAdminUser]
+    parser_classes = [CSVParser, MultiPartParser]
+    max_rows = 500
+
+    def post(self, request):
+        if isinstance(request.data, str):
+            text = request.data
+        elif 'file' in request.FILES:
+            try:
+                text = request.FILES['file'].read().decode('utf-8-sig')
+            except UnicodeDecodeError:
+                return Response({'error': 'CSV must be UTF-8'}, status=status.HTTP_400_BAD_REQUEST)
+        else:
+            return Response({'error': 'Send a text/csv body or a multipart "file"'}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            rows = read_operator_csv(text)
+        except InvalidOperatorCSV as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        if len(rows) > self.max_rows:
+            return Response({'error': f'At most {self.max_rows} operators per import'}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            results = import_operators(rows)
+        except IntegrityError:
+            return Response({'error': 'Some usernames were taken while importing; nothing was created, please retry'}, status=status.HTTP_409_CONFLICT)
+        all_created = all(result['status'] == 'created' for result in results)
+        return Response({'results': results}, status=status.HTTP_201_CREATED if all_created else status.HTTP_207_MULTI_STATUS)
+
 class OperatorDeleteView(generics.DestroyAPIView):
     queryset = User.objects.filter(is_staff=False)
     serializer_class = OperatorListSerializer
     permission_classes = [permissions.IsAuthenticated, permissions.IsAdminUser]
 
+    def perform_destroy(self, instance):
+        # chunked, rather than one cascade through every order in a single transaction
+        delete_orders(Order.objects.filter(created_by_id=instance.pk))
+        instance.delete()
+
 
 class RegisterView(APIView):
     permission_classes = [permissions.AllowAny]
+    throttle_classes = [RegisterIPThrottle]
 
     def post(self, request):
         serializer = RegisterSerializer(data=request.data)
@@ -54,6 +144,8 @@ class RegisterView(APIView):
     
 class LoginView(APIView):
     permission_classes = [permissions.AllowAny]
+    # rejected before the password is hashed
+    throttle_classes = [LoginIPThrottle, LoginUsernameThrottle]
 
     def post(self, request):
         serializer = LoginSerializer(data=request.data)
@@ -72,72 +164,141 @@ class LoginView(APIView):
 
 class LogoutView(APIView):
     def post(self, request):
+        user_id = request.user.pk
         logout(request)
+        if user_id is not None:
+            invalidate_cached_user(user_id)
         return Response({"message": "Logged out"})
 
+class TokenLoginView(TokenObtainPairView):
+    """JWT alternative to LoginView for devices that can't keep a session"""
+    serializer_class = TokenLoginSerializer
+    throttle_classes = [LoginIPThrottle, LoginUsernameThrottle]
+
+
+class TokenRefreshAccessView(TokenRefreshView):
+    serializer_class = TokenRevocableRefreshSerializer
+
+
+class TokenRevokeView(APIView):
+    """Revoke a refresh token, and the access token the request was made with"""
+    permission_classes = [permissions.AllowAny]
+    # a device logging out may hold an expired access token; that mustn't block revoking the refresh token
+    authentication_classes = []
+
+    def post(self, request):
+        serializer = TokenRevokeSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            refresh = RefreshToken(serializer.validated_data["refresh"])
+        except TokenError as e:
+            return Response({"error": str(e)}, status=status.HTTP_401_UNAUTHORIZED)
+        revoke_token(refresh)
+        access = _bearer_access_token(request)
+        if access is not None:
+            revoke_token(access)
+        return Response({"message": "Token revoked"})
+
+
+def _bearer_access_token(request):
+    """The request's bearer access token if it is still valid, else None"""
+    authentication = StatelessJWTAuthentication()
+    header = authentication.get_header(request)
+    if header is None:
+        return None
+    try:
+        raw_token = authentication.get_raw_token(header)
+        return AccessToken(raw_token) if raw_token is not None else None
+    except (AuthenticationFailed, TokenError):
+        # expired or malformed: nothing left to revoke
+        return None
+
+def _store_uploaded_fingerprints(request):
+    """Blob references for the fingerprint file parts of a multipart request"""
+    refs = {}
+    for field_name, upload in request.FILES.items():
+        finger = field_name[len(FINGERPRINT_FIELD_PREFIX):]
+        try:
+            if settings.FINGERPRINT_NORMALIZE:
+                # one finger in memory at a time, bounded by FINGERPRINT_MAX_UPLOAD_SIZE
+                try:
+                    refs[finger] = store_fingerprint_image(upload.read())
+                except ValueError as e:
+                    # the fingers stored so far belong to no order
+                    queue_blob_sweep(order_blobs(refs))
+                    raise InvalidFingerprint(finger, str(e))
+            else:
+                refs[finger] = {
+                    "blob": blob_store.put_file(upload, upload.sha256),
+                    "content_type": upload.image_info["content_type"],
+                    "size": upload.size,
+                }
+        finally:
+            upload.close()
+    return refs
+
+
 class OrderView(APIView):
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = OrderPagination
+
+    def initialize_request(self, request, *args, **kwargs):
+        # must happen before anything (including the CSRF check) reads the body
+        if request.method == 'POST' and request.content_type == 'multipart/form-data':
+            request.fingerprint_uploads = FingerprintUploadHandler(request)
+            request.upload_handlers = [request.fingerprint_uploads]
+        return super().initialize_request(request, *args, **kwargs)
     
     def get(self, request):
-        orderType = request.query_params.get('type', None)
-
         if request.user.is_staff:
-            orders = Order.objects.all()
+            orders = Order.objects.summary()
         else:
-            orders = Order.objects.filter(created_by=request.user)
-        
-        if orderType:
-            orders = orders.filter(orderType=orderType)
+            orders = Order.objects.summary().filter(created_by_id=request.user.id)
 
-       
-        serializer = OrderListSerializer(orders, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        filterset = OrderFilter(request.query_params, queryset=orders, request=request)
+        if not filterset.is_valid():
+            return Response(filterset.errors, status=status.HTTP_400_BAD_REQUEST)
+        orders = filterset.qs
 
-    def post(self, request):
-        serializer = OrderSerializer(data=request.data)
-        if serializer.is_valid():
-            order = serializer.save(created_by=request.user)
-            validated_data = serializer.validated_data
+        paginator = self.pagination_class()
+        page = paginator.paginate_queryset(orders, request, view=self)
+        serializer = OrderListSerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
 
-            orderType = validated_data['orderType']
-            
-            def make_json_serializable(data):
-                for key, value in data.items():
-                    if isinstance(value, date):
-                        data[key] = value.isoformat()  # "YYYY-MM-DD"
-                return data
-            
-            validated_data_serializable = make_json_serializable(dict(validated_data))
-            
+    def post(self, request):
+        uploads = getattr(request._request, 'fingerprint_uploads', None)
+        if uploads is None:
+            serializer = OrderSerializer(data=request.data)
+        else:
+            data = {key: request.data.get(key) for key in request.data if not key.startswith(FINGERPRINT_FIELD_PREFIX)}
+            if uploads.rejected:
+                return Response({'fingerprints': uploads.rejected}, status=status.HTTP_400_BAD_REQUEST)
+            # validate against placeholders so a rejected order stores nothing
+            data['fingerprints'] = {field_name[len(FINGERPRINT_FIELD_PREFIX):]: True for field_name in request.FILES}
+            serializer = OrderSerializer(data=data)
+            if not serializer.is_valid():
+                return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
             try:
-                fingerprints = validated_data.get('fingerprints', {})
-
-                order_fields = {
-                'orderType': orderType,
-                'fullName': validated_data.get('fullName', ''),
-                'aadhaarNumber': validated_data.get('aadhaarNumber', ''),
-                'mobileNumber': validated_data.get('mobileNumber', ''),
-                'fatherName': validated_data.get('fatherName', ''),
-                'gender': validated_data.get('gender', ''),
-                'formData': validated_data_serializable,
-                'fingerprints': fingerprints
-                }
-
-                if validated_data.get('dateOfBirth'):
-                    order_fields['dateOfBirth'] = validated_data['dateOfBirth']
+                serializer.context['stored_fingerprints'] = _store_uploaded_fingerprints(request)
+            except InvalidFingerprint as e:
+                return Response({'fingerprints': {e.finger: str(e)}}, status=status.HTTP_400_BAD_REQUEST)
 
+        if serializer.is_valid():
+            try:
+                order = serializer.save(created_by_id=request.user.id)
+            except Exception:
+                queue_blob_sweep(order_blobs(serializer.context.get('stored_fingerprints')))
+                raise
+            queue_enhancement([order])
 
-                response_data = {
-                    'message': 'Order submitted successfully',
-                    'application_id': f"APP_{orderType.upper()}_{hash(validated_data['fullName'])}",
-                    'order_type': orderType,
-                    'formData': validated_data,
-                    'fingerprints_received': list(fingerprints.keys()) if fingerprints else []
-                }
-                
-                return Response(response_data, status=status.HTTP_201_CREATED)
-            except Exception as e:
-                return Response({"Failed to process data": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+            response_data = {
+                'message': 'Order submitted successfully',
+                'id': order.pk,
+                'application_id': order.application_id,
+                'order_type': order.orderType,
+                'fingerprints': _fingerprint_urls(request, order, request.user.is_staff),
+            }
+            return Response(response_data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
     
 
@@ -145,47 +306,262 @@ class OrderView(APIView):
         pk = kwargs.get("pk")
         if not pk:
             return Response({'error':'order id not provided'}, status=400)
+        orders = Order.objects.filter(pk=pk)
+        if not request.user.is_staff:
+            orders = orders.filter(created_by_id=request.user.id)
         try:
-            order = Order.objects.get(pk=pk)
-            if not request.user.is_staff and order.created_by != request.user:
+            if delete_orders(orders):
+                return Response({'message':'Order Deleted'}, status=status.HTTP_204_NO_CONTENT)
+            # nothing matched: only now find out whether the order exists at all
+            if Order.objects.filter(pk=pk).exists():
                 return Response({"error":'Not authorized'}, status=status.HTTP_403_FORBIDDEN)
-            
-            order.delete()
-            return Response({'message':'Order Deleted'}, status=status.HTTP_204_NO_CONTENT)
-        except Order.DoesNotExist:
             return Response({'error':f'Order not found'}, status=status.HTTP_404_NOT_FOUND)
         except Exception as e:
             return Response({'error': f'An internal server error occurred: {str(e)}'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+class OrderBulkView(APIView):
+    """Create many orders in one request (JSON array or NDJSON), one result per item, or delete many"""
+    permission_classes = [permissions.IsAuthenticated]
+    parser_classes = [JSONParser, NDJSONParser]
+    max_items = 500
+    insert_batch_size = 100
+    max_deletes = 5000
+
+    def post(self, request):
+        items = request.data
+        if not isinstance(items, list):
+            return Response({'error': 'Expected a list of orders'}, status=status.HTTP_400_BAD_REQUEST)
+        if len(items) > self.max_items:
+            return Response({'error': f'At most {self.max_items} orders per request'}, status=status.HTTP_400_BAD_REQUEST)
+
+        for attempt in range(2):
+            try:
+                results, created = self.create_orders(request.user.id, items)
+                break
+            except IntegrityError:
+                # a concurrent retry of the same sync committed first; its keys are now visible
+                if attempt:
+                    raise
+        queue_enhancement(created)
+
+        all_created = all(result['status'] == 'created' for result in results)
+        return Response({'results': results}, status=status.HTTP_201_CREATED if all_created else status.HTTP_207_MULTI_STATUS)
+
+    def delete(self, request):
+        """Delete {"ids": [...]} or {"filter": {...}} (the order list's filters), up to max_deletes per request"""
+        data = request.data if isinstance(request.data, dict) else {}
+        orders = Order.objects.all()
+        if not request.user.is_staff:
+            orders = orders.filter(created_by_id=request.user.id)
+
+        ids, filters = data.get('ids'), data.get('filter')
+        if ids is not None:
+            if not isinstance(ids, list) or len(ids) > self.max_items or not all(type(pk) is int for pk in ids):
+                return Response({'ids': [f'A list of at most {self.max_items} order ids.']}, status=status.HTTP_400_BAD_REQUEST)
+            orders = orders.filter(pk__in=ids)
+        elif isinstance(filters, dict):
+            filterset = OrderFilter(filters, queryset=orders, request=request)
+            if not filterset.is_valid():
+                return Response(filterset.errors, status=status.HTTP_400_BAD_REQUEST)
+            if not any(value not in (None, '') for value in filterset.form.cleaned_data.values()):
+                return Response({'filter': ['At least one filter is required.']}, status=status.HTTP_400_BAD_REQUEST)
+            orders = filterset.qs
+        else:
+            return Response({'error': 'Expected "ids" or "filter"'}, status=status.HTTP_400_BAD_REQUEST)
+
+        deleted = delete_orders(orders, limit=self.max_deletes)
+        # clients repeat the request while more is true
+        more = deleted == self.max_deletes and orders.exists()
+        return Response({'deleted': deleted, 'more': more}, status=status.HTTP_200_OK)
+
+    @staticmethod
+    def valid_key(key):
+        return key is None or (isinstance(key, str) and len(key) <= 64)
+
+    def create_orders(self, user_id, items):
+        keys = [item.get('idempotencyKey') if isinstance(item, dict) else None for item in items]
+        existing = dict(
+            Order.objects.filter(created_by_id=user_id, idempotencyKey__in=[key for key in keys if self.valid_key(key) and key])
+            .values_list('idempotencyKey', 'id')
+        )
+
+        results = [None] * len(items)
+        pending = []
+        seen_keys = {}
+        for index, (item, key) in enumerate(zip(items, keys)):
+            if not self.valid_key(key):
+                results[index] = {'index': index, 'status': 'invalid', 'errors': {'idempotencyKey': ['Must be a string of at most 64 characters.']}}
+                continue
+            if key in existing:
+                results[index] = {'index': index, 'status': 'duplicate', 'id': existing[key]}
+                continue
+            if key and key in seen_keys:
+                results[index] = {'index': index, 'status': 'duplicate', 'duplicate_of': seen_keys[key]}
+                continue
+
+            serializer = OrderSerializer(data=item)
+            if not serializer.is_valid():
+                results[index] = {'index': index, 'status': 'invalid', 'errors': serializer.errors}
+                continue
+
+            data = dict(serializer.validated_data)
+            try:
+                data['fingerprints'] = save_fingerprints(data.get('fingerprints'))
+            except InvalidFingerprint as e:
+                results[index] = {'index': index, 'status': 'invalid', 'errors': {'fingerprints': {e.finger: str(e)}}}
+                continue
+            pending.append((index, Order(**data, created_by_id=user_id, idempotencyKey=key or None)))
+            if key:
+                seen_keys[key] = index
+
+        created = []
+        with transaction.atomic():
+            for start in range(0, len(pending), self.insert_batch_size):
+                batch = [order for _, order in pending[start:start + self.insert_batch_size]]
+                created.extend(Order.objects.bulk_create(batch))
+            # bulk_create skips post_save, so the statistics and blob references are updated here
+            record_orders(created)
+            index_order_blobs(created)
+
+        for (index, order) in pending:
+            results[index] = {'index': index, 'status': 'created', 'id': order.pk, 'application_id': order.application_id}
+        return results, created
+
+
+class OrderStatsView(APIView):
+    """Order counts from the OrderDailyStat summary, grouped by ?group_by=type,operator,district,state,day|week|month"""
+    permission_classes = [permissions.IsAuthenticated]
+    groupings = {
+        'type': F('order_type'),
+        'operator': 'operator',
+        'district': 'district',
+        'state': 'state',
+        'day': 'day',
+        'week': TruncWeek('day'),
+        'month': TruncMonth('day'),
+    }
+    periods = ('day', 'week', 'month')
+
+    def get(self, request):
+        group_by = [name for name in request.query_params.get('group_by', '').split(',') if name]
+        unknown = [name for name in group_by if name not in self.groupings]
+        if unknown or len(set(group_by) & set(self.periods)) > 1:
+            return Response({'group_by': f"Comma-separated names from {', '.join(self.groupings)}, with at most one of day, week or month."}, status=status.HTTP_400_BAD_REQUEST)
+
+        stats = OrderDailyStat.objects.all()
+        if not request.user.is_staff:
+            stats = stats.filter(operator_id=request.user.id)
+        filterset = OrderStatFilter(request.query_params, queryset=stats, request=request)
+        if not filterset.is_valid():
+            return Response(filterset.errors, status=status.HTTP_400_BAD_REQUEST)
+        stats = filterset.qs
+        total = stats.aggregate(total=Sum('count'))['total'] or 0
+        if not group_by:
+            # ungrouped .values() would hand back the raw summary rows
+            return Response({'group_by': [], 'total': total, 'results': []})
+
+        columns = {name: self.groupings[name] for name in dict.fromkeys(group_by)}
+        if 'operator' in columns:
+            columns['operator_username'] = F('operator__username')
+        fields = [name for name, column in columns.items() if isinstance(column, str)]
+        expressions = {name: column for name, column in columns.items() if not isinstance(column, str)}
+        results = (
+            stats.values(*fields, **expressions)
+            .annotate(count=Sum('count'))
+            .filter(count__gt=0)
+            .order_by(*columns)
+        )
+        return Response({'group_by': list(columns), 'total': total, 'results': list(results)})
+
+
+class OrderExportView(APIView):
+    """Streams every matching order as CSV or NDJSON without building it in memory"""
+    permission_classes = [permissions.IsAuthenticated]
+    content_types = {'csv': 'text/csv; charset=utf-8', 'ndjson': 'application/x-ndjson'}
+
+    def get(self, request, fmt):
+        if fmt not in self.content_types:
+            return Response({'error': 'Export format must be csv or ndjson'}, status=status.HTTP_404_NOT_FOUND)
+
+        if request.user.is_staff:
+            orders = Order.objects.all()
+        else:
+            orders = Order.objects.filter(created_by_id=request.user.id)
+
+        filterset = OrderFilter(request.query_params, queryset=orders, request=request)
+        if not filterset.is_valid():
+            return Response(filterset.errors, status=status.HTTP_400_BAD_REQUEST)
+        orders = filterset.qs.order_by('created_at', 'id')
+
+        compress = request.query_params.get('gzip') in ('1', 'true')
+        stream = export_stream(orders, fmt, compress=compress)
+        if isinstance(request._request, ASGIRequest):
+            stream = astream(stream)
+        response = StreamingHttpResponse(stream, content_type=self.content_types[fmt])
+        response['Content-Disposition'] = f'attachment; filename="orders-{timezone.now():%Y%m%d}.{fmt}"'
+        if compress:
+            response['Content-Encoding'] = 'gzip'
+        return response
+
+
+def _enhanced_png(ref):
+    if ref["enhanced"]:
+        return blob_store.read(ref["enhanced"])
+    return get_enhanced_fingerprint(ref)
+
+
+def _inline_fingerprints(order, enhance, precomputed=None):
+    """Fingerprints with base64 BitmapData, for clients that predate image URLs"""
+    if not enhance:
+        return load_fingerprints(order.fingerprints)
+
+    # enhance fingerprints for admin, preferring the worker's results
+    if precomputed is None:
+        precomputed = enhanced_results(order)
+    sources = {
+        finger: {**value, "enhanced": precomputed.get(finger)}
+        for finger, value in (order.fingerprints or {}).items()
+        if isinstance(value, dict) and value.get("blob")
+    }
+    enhanced = enhance_fingerprints(sources, enhance=_enhanced_png)
+
+    enhanced_fingerprints = {}
+    for finger, value in (order.fingerprints or {}).items():
+        if isinstance(enhanced.get(finger), bytes):
+            meta = {k: v for k, v in value.items() if k != "blob"}
+            enhanced_fingerprints[finger] = {**meta, "BitmapData": base64.b64encode(enhanced[finger]).decode("ascii")}
+        else:
+            enhanced_fingerprints[finger] = load_fingerprints({finger: value})[finger]
+    return enhanced_fingerprints
+
+
+def _fingerprint_urls(request, order, enhanced):
+    fingerprints = {}
+    for finger, value in (order.fingerprints or {}).items():
+        if not (isinstance(value, dict) and value.get("blob")):
+            fingerprints[finger] = value
+            continue
+        url = request.build_absolute_uri(reverse("order-fingerprint-image", kwargs={"pk": order.pk, "finger": finger}))
+        meta = {k: v for k, v in value.items() if k != "blob"}
+        fingerprints[finger] = {**meta, "url": url}
+        if enhanced:
+            fingerprints[finger]["enhanced_url"] = f"{url}?variant=enhanced"
+    return fingerprints
+
+
 class FingerprintsView(APIView):
     permission_classes = [permissions.IsAuthenticated]
     
     def get(self, request, pk):
         try:
-            order = Order.objects.get(pk=pk)
-            if not request.user.is_staff and order.created_by != request.user:
+            order = Order.objects.full().get(pk=pk)
+            if not request.user.is_staff and order.created_by_id != request.user.id:
                 return Response({"error": "Not authorized"}, status=status.HTTP_403_FORBIDDEN)
 
-            fingerprints = order.fingerprints or {}
-            if (request.user.is_staff):
-                # enhance fingerprints for admin
-                enhanced_fingerprints = {}
-                for finger, value in fingerprints.items():
-                    try:
-                        if isinstance(value, dict):
-                            img_base64 = value["BitmapData"]
-                            enhanced_img = enhance_fingerprint(img_base64)
-                            enhanced_fingerprints[finger] = {**value, "BitmapData": enhanced_img}
-                        else:
-                            enhanced_fingerprints[finger] = value 
-                        # enhanced_fingerprints[finger] = enhance_fingerprint(img_base64)
-
-                    except Exception as e:
-                        enhanced_fingerprints[finger] = value
-                fingerprints = enhanced_fingerprints
+            if request.query_params.get("inline"):
+                fingerprints = _inline_fingerprints(order, enhance=request.user.is_staff)
             else:
-                # simple fingerprints
-                pass
+                fingerprints = _fingerprint_urls(request, order, request.user.is_staff)
             
             serilizer = OrderSerializer(order, many=False)
             data = serilizer.data
@@ -194,4 +570,49 @@ class FingerprintsView(APIView):
         except Order.DoesNotExist:
             return Response({"error":"Order not found."}, status=status.HTTP_404_NOT_FOUND)
         except Exception as e:
-            return Response({"error":str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
\ No newline at end of file
+            return Response({"error":str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class FingerprintImageView(APIView):
+    """Raw fingerprint image with ETag/Last-Modified, 304s and byte ranges"""
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, pk, finger):
+        variant = request.query_params.get("variant", "original")
+        if variant not in ("original", "enhanced"):
+            return Response({"error": "variant must be original or enhanced"}, status=status.HTTP_400_BAD_REQUEST)
+        if variant == "enhanced" and not request.user.is_staff:
+            return Response({"error": "Not authorized"}, status=status.HTTP_403_FORBIDDEN)
+
+        try:
+            order = Order.objects.refs().get(pk=pk)
+        except Order.DoesNotExist:
+            return Response({"error": "Order not found."}, status=status.HTTP_404_NOT_FOUND)
+        if not request.user.is_staff and order.created_by_id != request.user.id:
+            return Response({"error": "Not authorized"}, status=status.HTTP_403_FORBIDDEN)
+
+        ref = (order.fingerprints or {}).get(finger)
+        if not (isinstance(ref, dict) and ref.get("blob")):
+            return Response({"error": "Fingerprint not found."}, status=status.HTTP_404_NOT_FOUND)
+
+        last_modified = int(order.created_at.timestamp())
+        if variant == "original":
+            return binary_response(
+                request, lambda: blob_store.read(ref["blob"]), ref.get("content_type", "application/octet-stream"),
+                etag=ref["blob"], last_modified=last_modified,
+            )
+
+        # the worker and the cache produce identical bytes, so one validator fits both
+        result = enhanced_results(order).get(finger)
+        return binary_response(
+            request, (lambda: blob_store.read(result)) if result else (lambda: get_enhanced_fingerprint(ref)), "image/png",
+            etag=enhanced_cache_key(ref["blob"]), last_modified=last_modified, cache_control="private, max-age=3600",
+        )
+
+
+class MetricsView(APIView):
+    """Request metrics of this process in the Prometheus text format"""
+    permission_classes = [permissions.IsAuthenticated, permissions.IsAdminUser]
+
+    def get(self, request):
+        return HttpResponse(registry.render(), content_type="text/plain; version=0.0.4; charset=utf-8")
@@ -0,0 +1,41 @@
+"""Gunicorn settings for the ASGI deployment (Procfile: `gunicorn -c gunicorn.conf.py`).
+
+Each worker runs Django's ASGI application in a uvicorn event loop, so one
+process can hold hundreds of slow connections (mobile clients uploading
+fingerprints) instead of one per sync worker. The /api/async/ endpoints use the
+async ORM; the DRF endpoints still work but each request runs in the worker's
+sync thread, so they serialize per process just like before. Streaming
+responses must hand Django an async iterator here (see core.export.astream),
+or it buffers them whole before sending.
+
+Every value can be overridden from the environment.
+"""
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+wsgi_app = "backend.asgi:application"
+worker_class = "backend.workers.UvicornLimitedWorker"
+
+# event-loop workers aren't limited by connections, only by CPU, so stay near one per core
+workers = int(os.environ.get("WEB_CONCURRENCY", multiprocessing.cpu_count() + 1))
+
+# per-worker concurrency cap is UVICORN_LIMIT_CONCURRENCY, see backend/workers.py
+backlog = int(os.environ.get("GUNICORN_BACKLOG", 2048))
+
+# a worker that stops answering the arbiter (e.g. the loop is blocked) is restarted after this
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", 60))
+graceful_timeout = int(os.environ.get("GUNICORN_GRACEFUL_TIMEOUT", 30))
+keepalive = int(os.environ.get("GUNICORN_KEEPALIVE", 5))
+
+# recycle workers now and then so a leak in OpenCV or numpy can't grow forever
+max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", 2000))
+max_requests_jitter = int(os.environ.get("GUNICORN_MAX_REQUESTS_JITTER", 200))
+
+# importing the app before forking shares the OpenCV/numpy pages between workers
+preload_app = True
+chdir = os.path.dirname(os.path.abspath(__file__))
+
+accesslog = "-"
+errorlog = "-"
+loglevel = os.environ.get("GUNICORN_LOG_LEVEL", "info")